@@ -9,6 +9,17 @@ import numpy as np
 import json
 from pathlib import Path
 
+# 可选依赖：pyarrow（多线程CSV解析，未安装时使用pandas默认解析器）
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# CSV中按文本读取的维度字段（机构编码等纯数字取值不会被推断成数值）
+CSV_KEY_DTYPES = {'机构': 'str', '客户类别': 'str'}
+
 
 class DataTransformer:
     """数据转换器 - 处理字段映射和数据聚合"""
@@ -147,9 +158,18 @@ class DataTransformer:
 
         results = []
 
+        # 两个维度都需要时只扫描一次明细：先按 机构×客户类别 分组得到汇总立方体，
+        # 单维度汇总在行数很少的立方体上按层级再求和（保留空值键，单维度汇总与直接分组一致）
+        cube = None
+        if "机构" in dimensions and "客户类别" in dimensions:
+            cube = df.groupby(["机构", "客户类别"], dropna=False).agg(agg_dict)
+
         # 1. 分机构聚合
         if "机构" in dimensions:
-            org_agg = df.groupby("机构").agg(agg_dict).reset_index()
+            if cube is not None:
+                org_agg = cube.groupby(level="机构").sum().reset_index()
+            else:
+                org_agg = df.groupby("机构").agg(agg_dict).reset_index()
             # 重命名聚合后的字段
             rename_map = {v: k for k, v in agg_fields.items() if v in org_agg.columns}
             org_agg = org_agg.rename(columns=rename_map)
@@ -158,15 +178,18 @@ class DataTransformer:
 
         # 2. 分客户类别聚合
         if "客户类别" in dimensions:
-            cust_agg = df.groupby("客户类别").agg(agg_dict).reset_index()
+            if cube is not None:
+                cust_agg = cube.groupby(level="客户类别").sum().reset_index()
+            else:
+                cust_agg = df.groupby("客户类别").agg(agg_dict).reset_index()
             rename_map = {v: k for k, v in agg_fields.items() if v in cust_agg.columns}
             cust_agg = cust_agg.rename(columns=rename_map)
             cust_agg["机构"] = "全部"
             results.append(cust_agg)
 
         # 3. 分机构+客户类别聚合
-        if "机构" in dimensions and "客户类别" in dimensions:
-            org_cust_agg = df.groupby(["机构", "客户类别"]).agg(agg_dict).reset_index()
+        if cube is not None:
+            org_cust_agg = cube.reset_index().dropna(subset=["机构", "客户类别"])
             rename_map = {v: k for k, v in agg_fields.items() if v in org_cust_agg.columns}
             org_cust_agg = org_cust_agg.rename(columns=rename_map)
             results.append(org_cust_agg)
@@ -201,9 +224,13 @@ class DataTransformer:
                 # 支持的公式格式：字段名 / 字段名 * 100
                 df[metric_name] = self._eval_formula(df, formula, decimals)
 
-                # 处理异常值
+                # 处理异常值：浮点结果一次性把除零产生的 inf/NaN 置0（单次遍历、单次分配）
                 if error_handling == "替换为0":
-                    df[metric_name] = df[metric_name].replace([np.inf, -np.inf], 0).fillna(0)
+                    values = df[metric_name].to_numpy()
+                    if values.dtype.kind == 'f':
+                        df[metric_name] = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+                    else:
+                        df[metric_name] = df[metric_name].replace([np.inf, -np.inf], 0).fillna(0)
 
             except Exception as e:
                 print(f"  ⚠ 计算指标 '{metric_name}' 时出错: {e}")
@@ -280,6 +307,19 @@ class DataTransformer:
 
 
 # 便捷函数
+def read_csv_with_key_dtypes(data_file):
+    """读取CSV，维度字段按文本读取（保留 '001' 等编码的前导零）"""
+    if PYARROW_AVAILABLE:
+        # pandas 的 pyarrow 引擎先推断类型再应用 dtype，前导零此时已丢失，
+        # 因此直接在 pyarrow 解析阶段通过 column_types 声明为文本
+        convert_options = pa_csv.ConvertOptions(
+            column_types={col: pa.string() for col in CSV_KEY_DTYPES},
+            strings_can_be_null=True,
+        )
+        return pa_csv.read_csv(data_file, convert_options=convert_options).to_pandas()
+    return pd.read_csv(data_file, encoding='utf-8-sig', dtype=CSV_KEY_DTYPES)
+
+
 def auto_transform(df, mappings_file=None):
     """
     自动转换数据（一步完成检测+转换）
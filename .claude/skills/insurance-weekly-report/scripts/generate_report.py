@@ -19,11 +19,12 @@ import re
 
 # 导入数据转换模块
 try:
-    from data_transformer import DataTransformer
+    from data_transformer import DataTransformer, read_csv_with_key_dtypes
     DATA_TRANSFORMER_AVAILABLE = True
 except ImportError:
     print("⚠ 数据转换模块未找到，仅支持标准格式数据")
     DATA_TRANSFORMER_AVAILABLE = False
+    read_csv_with_key_dtypes = pd.read_csv
 
 # 可选依赖：DuckDB（如未安装则跳过）
 try:
@@ -35,6 +36,8 @@ except ImportError:
 
 # ============ 配置常量 ============
 MCKINSEY_RED = RGBColor(160, 39, 36)  # #a02724
+COLOR_BLACK = RGBColor(0, 0, 0)         # 标题文字
+COLOR_GRAY = RGBColor(128, 128, 128)    # 日期等辅助文字
 SLIDE_WIDTH = Inches(13.333)  # 16:9
 SLIDE_HEIGHT = Inches(7.5)
 MARGIN = Inches(0.8)
@@ -60,8 +63,8 @@ def validate_and_load(data_file):
             print(f"  ✓ Excel 文件已加载 ({len(df)} 行)")
 
         elif file_ext == '.csv':
-            # 自动检测编码和分隔符
-            df = pd.read_csv(data_file, encoding='utf-8-sig')
+            # 自动检测编码；维度字段显式声明为文本，免去类型推断
+            df = read_csv_with_key_dtypes(data_file)
             print(f"  ✓ CSV 文件已加载 ({len(df)} 行)")
 
         elif file_ext == '.json':
@@ -195,17 +198,19 @@ def calculate_kpis(df, config):
     
     kpis = {}
     
-    # 整体指标
+    # 整体指标（求和、均值各归约一次，边际贡献额复用已算出的结果）
+    sums = df[['签单保费', '已报告赔款']].sum()
+    means = df[['变动成本率', '满期赔付率', '费用率']].mean()
     kpis['total'] = {
-        '签单保费': df['签单保费'].sum(),
-        '变动成本率': df['变动成本率'].mean(),
-        '满期赔付率': df['满期赔付率'].mean(),
-        '费用率': df['费用率'].mean(),
-        '已报告赔款': df['已报告赔款'].sum(),
-        '边际贡献额': df['签单保费'].sum() * (1 - df['变动成本率'].mean() / 100)
+        '签单保费': sums['签单保费'],
+        '变动成本率': means['变动成本率'],
+        '满期赔付率': means['满期赔付率'],
+        '费用率': means['费用率'],
+        '已报告赔款': sums['已报告赔款'],
+        '边际贡献额': sums['签单保费'] * (1 - means['变动成本率'] / 100)
     }
     
-    # 分机构汇总
+    # 分机构汇总（以维度值为索引，不再 reset_index 复制整表）
     kpis['by_org'] = df.groupby('机构').agg({
         '签单保费': 'sum',
         '变动成本率': 'mean',
@@ -214,7 +219,7 @@ def calculate_kpis(df, config):
         '已报告赔款': 'sum',
         '出险率': 'mean',
         '案均赔款': 'mean'
-    }).reset_index()
+    })
     
     # 分客户类别汇总
     kpis['by_customer'] = df.groupby('客户类别').agg({
@@ -225,7 +230,7 @@ def calculate_kpis(df, config):
         '已报告赔款': 'sum',
         '出险率': 'mean',
         '案均赔款': 'mean'
-    }).reset_index()
+    })
     
     # 计算保费达成率（如果有计划数据）
     if config['plans'] is not None:
@@ -255,21 +260,18 @@ def identify_problems(kpis, thresholds):
     
     thresh = thresholds.get('问题机构识别阈值', {})
     
-    for _, row in kpis['by_org'].iterrows():
-        org = row['机构']
-        
-        # 检查变动成本率
-        if row['变动成本率'] > thresh.get('变动成本率超标', 95):
-            problems['cost_high'].append(org)
-        
-        # 检查满期赔付率
-        if row['满期赔付率'] > thresh.get('满期赔付率超标', 75):
-            problems['loss_high'].append(org)
-        
-        # 检查费用率
-        if row['费用率'] > thresh.get('费用率超标', 20):
-            problems['expense_high'].append(org)
-    
+    # by_org 以机构为索引，按列比较后直接取出超标机构
+    by_org = kpis['by_org']
+
+    # 检查变动成本率
+    problems['cost_high'] = by_org.index[by_org['变动成本率'] > thresh.get('变动成本率超标', 95)].tolist()
+
+    # 检查满期赔付率
+    problems['loss_high'] = by_org.index[by_org['满期赔付率'] > thresh.get('满期赔付率超标', 75)].tolist()
+
+    # 检查费用率
+    problems['expense_high'] = by_org.index[by_org['费用率'] > thresh.get('费用率超标', 20)].tolist()
+
     return problems
 
 # ============ 3. PPT 生成 ============
@@ -302,7 +304,7 @@ def add_title(slide, text, font_size=24):
     title_frame.paragraphs[0].font.size = Pt(font_size)
     title_frame.paragraphs[0].font.name = '微软雅黑'
     title_frame.paragraphs[0].font.bold = True
-    title_frame.paragraphs[0].font.color.rgb = RGBColor(0, 0, 0)
+    title_frame.paragraphs[0].font.color.rgb = COLOR_BLACK
 
 def generate_ppt(kpis, config, week_number, org_name, output_path):
     """生成完整PPT"""
@@ -367,7 +369,7 @@ def create_cover_slide(prs, org_name, week_number):
     tf2.text = date_str
     tf2.paragraphs[0].font.size = Pt(16)
     tf2.paragraphs[0].font.name = '微软雅黑'
-    tf2.paragraphs[0].font.color.rgb = RGBColor(128, 128, 128)
+    tf2.paragraphs[0].font.color.rgb = COLOR_GRAY
 
 def create_overview_page1(prs, kpis, config):
     """经营概览 - 整体指标"""
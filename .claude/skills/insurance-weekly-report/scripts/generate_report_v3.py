@@ -23,13 +23,20 @@ import matplotlib
 matplotlib.use('Agg')  # 非GUI后端
 import io
 
+# 图表中文字体在导入时统一配置一次，不再在每个图表函数中重复设置（每次赋值都要经过 rcParams 校验）
+plt.rcParams.update({
+    'font.sans-serif': ['Arial Unicode MS', 'SimHei', 'DejaVu Sans'],
+    'axes.unicode_minus': False,
+})
+
 # 导入数据转换模块
 try:
-    from data_transformer import DataTransformer
+    from data_transformer import DataTransformer, read_csv_with_key_dtypes
     DATA_TRANSFORMER_AVAILABLE = True
 except ImportError:
     print("⚠ 数据转换模块未找到，仅支持标准格式数据")
     DATA_TRANSFORMER_AVAILABLE = False
+    read_csv_with_key_dtypes = pd.read_csv
 
 # ============ 配置常量 ============
 MCKINSEY_RED = RGBColor(160, 39, 36)  # #a02724
@@ -39,9 +46,11 @@ MARGIN = Inches(0.8)
 
 # 状态颜色
 COLOR_GREEN = RGBColor(0, 176, 80)      # #00b050 优秀
+COLOR_LIGHT_GREEN = RGBColor(146, 208, 80)  # #92d050 良好
 COLOR_YELLOW = RGBColor(255, 192, 0)    # #ffc000 预警
 COLOR_RED = RGBColor(192, 0, 0)         # #c00000 严重
 COLOR_GRAY = RGBColor(127, 127, 127)    # 中性
+COLOR_BLACK = RGBColor(0, 0, 0)         # 标题文字
 
 # ============ 1. 数据加载与验证 ============
 
@@ -59,7 +68,7 @@ def load_data(data_file):
         df = pd.read_excel(data_file)
         print(f"  ✓ Excel 文件已加载 ({len(df)} 行)")
     elif ext == '.csv':
-        df = pd.read_csv(data_file)
+        df = read_csv_with_key_dtypes(data_file)
         print(f"  ✓ CSV 文件已加载 ({len(df)} 行)")
     elif ext == '.json':
         df = pd.read_json(data_file)
@@ -150,15 +159,22 @@ def calculate_kpis(df, config):
 
     kpis = {}
 
-    # 整体汇总(年累计)
+    # 整体汇总(年累计)：权重列只求和一次，各加权平均复用同一合计值
+    premium_sum = df['签单保费'].sum()
+    matured_col = '满期保费' if '满期保费' in df.columns else '签单保费'
+    matured_sum = df[matured_col].sum()
+    if '费用额' in df.columns:
+        expense_sum = df['费用额'].sum()
+    else:
+        expense_sum = (df['签单保费'] * df['费用率'] / 100).sum()
     kpis['overall'] = {
-        '签单保费': df['签单保费'].sum(),
-        '满期保费': df.get('满期保费', df['签单保费']).sum(),
+        '签单保费': premium_sum,
+        '满期保费': matured_sum,
         '已报告赔款': df['已报告赔款'].sum(),
-        '费用额': df.get('费用额', df['签单保费'] * df['费用率'] / 100).sum(),
-        '变动成本率': weighted_average(df, '变动成本率', '签单保费'),
-        '满期赔付率': weighted_average(df, '满期赔付率', '满期保费') if '满期保费' in df.columns else weighted_average(df, '满期赔付率', '签单保费'),
-        '费用率': weighted_average(df, '费用率', '签单保费'),
+        '费用额': expense_sum,
+        '变动成本率': weighted_average(df, '变动成本率', '签单保费', premium_sum),
+        '满期赔付率': weighted_average(df, '满期赔付率', matured_col, matured_sum),
+        '费用率': weighted_average(df, '费用率', '签单保费', premium_sum),
     }
 
     # 计算边际贡献额
@@ -182,15 +198,17 @@ def calculate_kpis(df, config):
     print("✓ KPI计算完成")
     return kpis
 
-def weighted_average(df, value_col, weight_col):
-    """加权平均"""
+def weighted_average(df, value_col, weight_col, weight_sum=None):
+    """加权平均(weight_sum 为调用方已算出的权重合计时直接复用)"""
     # 如果weight_col是Series,转为列名
     if isinstance(weight_col, pd.Series):
         weight_values = weight_col
     else:
         weight_values = df[weight_col]
 
-    return (df[value_col] * weight_values).sum() / weight_values.sum()
+    if weight_sum is None:
+        weight_sum = weight_values.sum()
+    return (df[value_col] * weight_values).sum() / weight_sum
 
 def aggregate_by_dimension(df, dimension):
     """按维度聚合(如果数据已经是汇总格式,直接筛选)"""
@@ -247,25 +265,28 @@ def _aggregate_from_detail(df, dimension):
     # 执行聚合
     result = df.groupby(dimension).agg(agg_dict).reset_index()
 
-    # 计算率值指标(加权平均)
-    for dim_value in result[dimension].unique():
-        dim_data = df[df[dimension] == dim_value]
-        idx = result[result[dimension] == dim_value].index[0]
-
-        result.loc[idx, '变动成本率'] = weighted_average(dim_data, '变动成本率', '签单保费')
-
-        if '满期保费' in dim_data.columns:
-            result.loc[idx, '满期赔付率'] = weighted_average(dim_data, '满期赔付率', dim_data['满期保费'])
-        else:
-            result.loc[idx, '满期赔付率'] = weighted_average(dim_data, '满期赔付率', '签单保费')
-
-        result.loc[idx, '费用率'] = weighted_average(dim_data, '费用率', '签单保费')
-
-        if '出险率' in dim_data.columns:
-            result.loc[idx, '出险率'] = weighted_average(dim_data, '出险率', '签单保费')
-
-        if '案均赔款' in dim_data.columns:
-            result.loc[idx, '案均赔款'] = weighted_average(dim_data, '案均赔款', '签单保费')
+    # 计算率值指标(加权平均): 率值 -> 权重字段
+    rate_weights = {
+        '变动成本率': '签单保费',
+        '满期赔付率': '满期保费' if '满期保费' in df.columns else '签单保费',
+        '费用率': '签单保费',
+    }
+    for rate in ('出险率', '案均赔款'):
+        if rate in df.columns:
+            rate_weights[rate] = '签单保费'
+
+    # 一次分组同时求 Σ(率值×权重) 与 Σ权重，替代逐个维度值过滤明细再加权；
+    # 各率值整块与对应权重相乘，分子/分母用 ('num'/'den', 率值) 二级列区分，无需逐列拼接列名
+    rates = list(rate_weights)
+    weights = df[list(rate_weights.values())].to_numpy(dtype='float64', na_value=np.nan)
+    numerators = df[rates].to_numpy(dtype='float64', na_value=np.nan) * weights
+    weighted = pd.DataFrame(np.hstack([numerators, weights]),
+                            columns=pd.MultiIndex.from_product([['num', 'den'], rates]))
+    sums = weighted.groupby(df[dimension].to_numpy()).sum()
+    ratios = sums['num'] / sums['den']
+
+    for rate in rates:
+        result[rate] = result[dimension].map(ratios[rate])
 
     return result
 
@@ -380,7 +401,7 @@ def add_title(slide, text, font_size=24, bold=True):
     p.font.name = '微软雅黑'
     p.font.size = Pt(font_size)
     p.font.bold = bold
-    p.font.color.rgb = RGBColor(0, 0, 0)
+    p.font.color.rgb = COLOR_BLACK
 
 def get_status_color(value, indicator, thresholds):
     """根据指标值返回状态颜色"""
@@ -389,7 +410,7 @@ def get_status_color(value, indicator, thresholds):
         if value < 85:
             return COLOR_GREEN
         elif value < 95:
-            return RGBColor(146, 208, 80)  # 浅绿
+            return COLOR_LIGHT_GREEN
         elif value < 100:
             return COLOR_YELLOW
         else:
@@ -398,14 +419,14 @@ def get_status_color(value, indicator, thresholds):
         if value < 65:
             return COLOR_GREEN
         elif value < 75:
-            return RGBColor(146, 208, 80)
+            return COLOR_LIGHT_GREEN
         else:
             return COLOR_RED
     elif indicator == '费用率':
         if value < 16:
             return COLOR_GREEN
         elif value < 20:
-            return RGBColor(146, 208, 80)
+            return COLOR_LIGHT_GREEN
         else:
             return COLOR_RED
     else:
@@ -851,34 +872,31 @@ def generate_expense_analysis_customer_quadrant_page(prs, kpis, config):
 
 # ============ 图表生成功能 ============
 
+def _chart_points(data, label_col, x_col, y_col, problem_items):
+    """按列取出散点图的标签、坐标和问题项标记"""
+    problem_set = set(problem_items) if problem_items else set()
+    labels = data[label_col].tolist()
+    is_problem = [label in problem_set for label in labels]
+    return labels, data[x_col].to_numpy(), data[y_col].to_numpy(), is_problem
+
 def create_quadrant_chart(data, x_col, y_col, label_col, x_baseline, y_baseline,
                           x_label, y_label, title, problem_items=None):
     """创建四象限散点图(返回图片字节流)"""
 
-    # 设置中文字体
-    plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
-    plt.rcParams['axes.unicode_minus'] = False
-
     fig, ax = plt.subplots(figsize=(10, 6), facecolor='white')
 
     # 绘制基准线
     ax.axhline(y=y_baseline, color='gray', linestyle='--', linewidth=1, alpha=0.6)
     ax.axvline(x=x_baseline, color='gray', linestyle='--', linewidth=1, alpha=0.6)
 
-    # 绘制散点
-    for _, row in data.iterrows():
-        label = row[label_col]
-        x_val = row[x_col]
-        y_val = row[y_col]
-
-        # 判断是否为问题项
-        is_problem = problem_items and label in problem_items
-        color = '#c00000' if is_problem else '#a02724'  # 问题项标红
-
-        ax.scatter(x_val, y_val, s=200, color=color, alpha=0.7, edgecolors='white', linewidth=2)
+    # 绘制散点(整列一次绘制,问题项标红;不再逐行 iterrows 各画一个散点集合)
+    labels, x_vals, y_vals, is_problem = _chart_points(data, label_col, x_col, y_col, problem_items)
+    colors = ['#c00000' if problem else '#a02724' for problem in is_problem]
+    ax.scatter(x_vals, y_vals, s=200, c=colors, alpha=0.7, edgecolors='white', linewidth=2)
 
+    for label, x_val, y_val, problem in zip(labels, x_vals, y_vals, is_problem):
         # 标注名称(问题项必标,其他项选择性标注)
-        if is_problem or len(data) <= 12:
+        if problem or len(data) <= 12:
             ax.annotate(label, (x_val, y_val),
                        fontsize=10, ha='center', va='bottom',
                        xytext=(0, 8), textcoords='offset points')
@@ -919,10 +937,6 @@ def create_bubble_chart(data, x_col, y_col, size_col, label_col,
                         x_label, y_label, title, problem_items=None):
     """创建气泡图(返回图片字节流)"""
 
-    # 设置中文字体
-    plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
-    plt.rcParams['axes.unicode_minus'] = False
-
     fig, ax = plt.subplots(figsize=(10, 6), facecolor='white')
 
     # 计算气泡大小(归一化)
@@ -934,24 +948,18 @@ def create_bubble_chart(data, x_col, y_col, size_col, label_col,
     else:
         bubble_sizes = [min_size] * len(size_values)
 
-    # 绘制气泡
-    for idx, (i, row) in enumerate(data.iterrows()):
-        label = row[label_col]
-        x_val = row[x_col]
-        y_val = row[y_col]
-
-        # 判断是否为问题项
-        is_problem = problem_items and label in problem_items
-        color = '#c00000' if is_problem else '#a02724'
-
-        ax.scatter(x_val, y_val, s=bubble_sizes[idx],
-                  color=color, alpha=0.5, edgecolors='white', linewidth=2)
+    # 绘制气泡(整列一次绘制)
+    labels, x_vals, y_vals, is_problem = _chart_points(data, label_col, x_col, y_col, problem_items)
+    colors = ['#c00000' if problem else '#a02724' for problem in is_problem]
+    ax.scatter(x_vals, y_vals, s=bubble_sizes,
+              c=colors, alpha=0.5, edgecolors='white', linewidth=2)
 
+    for label, x_val, y_val, problem in zip(labels, x_vals, y_vals, is_problem):
         # 标注名称(问题项必标)
-        if is_problem or len(data) <= 10:
+        if problem or len(data) <= 10:
             ax.annotate(label, (x_val, y_val),
                        fontsize=10, ha='center', va='center',
-                       weight='bold' if is_problem else 'normal')
+                       weight='bold' if problem else 'normal')
 
     # 设置标签
     ax.set_xlabel(x_label, fontsize=12, color='#404040')
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试周报脚本读取CSV时维度字段按文本读取
+验证 '001' 等机构编码保留前导零（pyarrow 与 pandas 默认解析器两条路径）
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import data_transformer  # noqa: E402
+
+CSV_CONTENT = (
+    '\ufeff机构,客户类别,签单保费\n'
+    '001,01,100.5\n'
+    '010,02,200.0\n'
+    '100,10,300.0\n'
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'leading_zero.csv'
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_key_columns_keep_leading_zeros(use_pyarrow, csv_file, monkeypatch):
+    if use_pyarrow and not data_transformer.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow 未安装')
+    monkeypatch.setattr(data_transformer, 'PYARROW_AVAILABLE', use_pyarrow)
+
+    df = data_transformer.read_csv_with_key_dtypes(csv_file)
+
+    assert list(df.columns) == ['机构', '客户类别', '签单保费']
+    assert df['机构'].tolist() == ['001', '010', '100']
+    assert df['客户类别'].tolist() == ['01', '02', '10']
+    assert df['签单保费'].sum() == pytest.approx(600.5)
@@ -151,7 +151,11 @@ class KnowledgeBaseIndexer:
     
     def generate_readme(self) -> str:
         """生成README.md"""
-        readme = f'''# 项目知识库
+        return ''.join(self.iter_readme_parts())
+
+    def iter_readme_parts(self):
+        """按顺序逐段生成README.md内容（逐段产出，不再反复拼接整篇字符串）"""
+        yield f'''# 项目知识库
 
 > 索引更新于 {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -174,45 +178,45 @@ class KnowledgeBaseIndexer:
 '''
         # 添加文档列表
         for doc in self.index['documents']:
-            readme += f"- [{doc['name']}]({doc['file']}) - {doc['type']}\n"
+            yield f"- [{doc['name']}]({doc['file']}) - {doc['type']}\n"
             if doc['tags']:
                 tags_str = ', '.join([f'`#{tag}`' for tag in doc['tags']])
-                readme += f"  - 标签: {tags_str}\n"
+                yield f"  - 标签: {tags_str}\n"
             if doc['updated']:
-                readme += f"  - 最后更新: {doc['updated']}\n"
+                yield f"  - 最后更新: {doc['updated']}\n"
         
-        readme += "\n### 技术决策\n\n"
+        yield "\n### 技术决策\n\n"
         
         if self.index['decisions']:
             for dec in self.index['decisions']:
-                readme += f"- [{dec['name']}]({dec['file']})\n"
+                yield f"- [{dec['name']}]({dec['file']})\n"
         else:
-            readme += "*尚未提取技术决策，运行 `extract_patterns.py` 后自动生成*\n"
+            yield "*尚未提取技术决策，运行 `extract_patterns.py` 后自动生成*\n"
         
-        readme += "\n### 代码模式\n\n"
+        yield "\n### 代码模式\n\n"
         
         if self.index['code_patterns']:
             # 只展示前10个
             for pattern in self.index['code_patterns'][:10]:
-                readme += f"- `{pattern['name']}` - 来自 `{pattern['file']}`\n"
+                yield f"- `{pattern['name']}` - 来自 `{pattern['file']}`\n"
             
             if len(self.index['code_patterns']) > 10:
-                readme += f"\n*共 {len(self.index['code_patterns'])} 个代码模式，查看 patterns/code/ 获取完整列表*\n"
+                yield f"\n*共 {len(self.index['code_patterns'])} 个代码模式，查看 patterns/code/ 获取完整列表*\n"
         else:
-            readme += "*尚未提取代码模式，运行 `extract_patterns.py` 后自动生成*\n"
+            yield "*尚未提取代码模式，运行 `extract_patterns.py` 后自动生成*\n"
         
-        readme += "\n## 🏷️ 标签索引\n\n"
+        yield "\n## 🏷️ 标签索引\n\n"
         
         if self.index['tags']:
             for tag, files in sorted(self.index['tags'].items()):
-                readme += f"### #{tag}\n"
+                yield f"### #{tag}\n"
                 for file in files:
-                    readme += f"- [{Path(file).stem}]({file})\n"
-                readme += "\n"
+                    yield f"- [{Path(file).stem}]({file})\n"
+                yield "\n"
         else:
-            readme += "*文档中尚未使用标签*\n"
+            yield "*文档中尚未使用标签*\n"
         
-        readme += f'''
+        yield f'''
 ## 📊 知识库统计
 
 - 项目文档: {self.stats['docs']}
@@ -229,16 +233,14 @@ class KnowledgeBaseIndexer:
 - 修改文档后运行 `python scripts/generate_index.py <知识库路径>` 更新索引
 - 通过 `project-knowledge-base` Skill 管理知识库
 '''
-        
-        return readme
     
     def save_readme(self):
         """保存README.md"""
         readme_path = self.kb_path / 'README.md'
-        readme_content = self.generate_readme()
         
+        # 逐段写入文件
         with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+            f.writelines(self.iter_readme_parts())
         
         return readme_path
 
@@ -9,6 +9,7 @@ import sys
 import shutil
 from pathlib import Path
 from datetime import datetime
+from string import Template
 
 def create_directory_structure(base_path: str) -> dict:
     """
@@ -231,20 +232,18 @@ def generate_project_charter_template(output_path: str, project_name: str = "新
     
     return output_path
 
-def generate_tech_design_template(output_path: str, project_name: str = "新项目") -> str:
-    """生成技术方案文档模板（华安车险业务定制）"""
-    
-    template = f'''---
-项目名称: {project_name}
+# 技术方案文档模板：内含大量代码示例（花括号较多），使用 string.Template 的 $占位符，无需转义花括号
+TECH_DESIGN_TEMPLATE = Template('''---
+项目名称: $project_name
 文档类型: 技术方案文档
-创建日期: {datetime.now().strftime("%Y-%m-%d")}
-更新日期: {datetime.now().strftime("%Y-%m-%d")}
+创建日期: $today
+更新日期: $today
 技术负责人: 待填写
 评审状态: 待评审
 标签: [技术方案, 架构设计, 车险业务]
 ---
 
-# {project_name} - 技术方案文档
+# $project_name - 技术方案文档
 
 ## 一、技术选型
 
@@ -367,7 +366,7 @@ def load_data(file_path: str) -> pd.DataFrame:
    - 按影响程度排序
 
 3. **问题导向标题生成**
-   - 模板: "{{整体评价}}，{{问题机构}}机构{{具体问题}}"
+   - 模板: "{整体评价}，{问题机构}机构{具体问题}"
    - 示例: "本周成本控制良好(85.3%)，高新机构保费进度落后"
 
 #### 模块3: 报告生成模块（ReportBuilder）
@@ -450,14 +449,14 @@ Step 5: 输出交付
 
 **示例**:
 ```json
-{{
-  "问题机构识别阈值": {{
+{
+  "问题机构识别阈值": {
     "年保费未达标": 95,
     "变动成本率超标": 95,
     "满期赔付率超标": 75,
     "费用率超标": 20
-  }}
-}}
+  }
+}
 ```
 
 ### 决策4: 代码模式提取方法
@@ -478,7 +477,7 @@ pattern_decision = r'#\\s*@decision:\\s*(.+)'
 pattern_function = r'def\\s+(\\w+)\\s*\\(([^)]*)\\):'
 
 # 识别配置文件结构
-pattern_config = r'"(\\w+)":\\s*(\\{{[^}}]+\\}}|\\[[^\\]]+\\]|[^,\\n]+)'
+pattern_config = r'"(\\w+)":\\s*(\\{[^}]+\\}|\\[[^\\]]+\\]|[^,\\n]+)'
 ```
 
 ## 四、技术风险与应对
@@ -509,12 +508,12 @@ pattern_config = r'"(\\w+)":\\s*(\\{{[^}}]+\\}}|\\[[^\\]]+\\]|[^,\\n]+)'
 
 **示例配置**:
 ```json
-{{
-  "字段映射": {{
+{
+  "字段映射": {
     "机构": ["机构", "机构名称", "三级机构", "org_name"],
     "签单保费": ["签单保费", "保费", "premium"]
-  }}
-}}
+  }
+}
 ```
 
 ### 4.3 可维护性风险
@@ -543,13 +542,13 @@ def analyze_cost_rate(df: pd.DataFrame, thresholds: dict) -> dict:
         thresholds: 阈值配置字典
         
     Returns:
-        dict: {{
+        dict: {
             'overall_status': 'good',  # good/warning/critical
             'problem_orgs': ['高新机构', '成华机构'],
             'avg_cost_rate': 85.3
-        }}
+        }
     """
-    logger.info(f"开始分析成本率，数据行数: {{len(df)}}")
+    logger.info(f"开始分析成本率，数据行数: {len(df)}")
     # 分析逻辑...
 ```
 
@@ -561,11 +560,11 @@ def analyze_cost_rate(df: pd.DataFrame, thresholds: dict) -> dict:
 
 ```python
 # 图表生成器注册机制
-CHART_GENERATORS = {{
+CHART_GENERATORS = {
     'quadrant': generate_quadrant_chart,
     'bubble': generate_bubble_chart,
     'trend': generate_trend_chart
-}}
+}
 
 def add_chart_to_slide(slide, chart_type, data, **kwargs):
     """动态调用对应的图表生成函数"""
@@ -579,17 +578,17 @@ def add_chart_to_slide(slide, chart_type, data, **kwargs):
 **设计思路**: 将报告结构定义在配置文件中，支持用户自定义页面顺序
 
 ```json
-{{
+{
   "报告结构": [
-    {{"type": "cover", "enabled": true}},
-    {{"type": "overview", "pages": 2, "enabled": true}},
-    {{"type": "premium", "pages": 2, "enabled": true}},
-    {{"type": "cost", "pages": 2, "enabled": true}},
-    {{"type": "loss", "pages": 4, "enabled": true}},
-    {{"type": "expense", "pages": 2, "enabled": true}},
-    {{"type": "trend", "pages": 1, "enabled": false}}
+    {"type": "cover", "enabled": true},
+    {"type": "overview", "pages": 2, "enabled": true},
+    {"type": "premium", "pages": 2, "enabled": true},
+    {"type": "cost", "pages": 2, "enabled": true},
+    {"type": "loss", "pages": 4, "enabled": true},
+    {"type": "expense", "pages": 2, "enabled": true},
+    {"type": "trend", "pages": 1, "enabled": false}
   ]
-}}
+}
 ```
 
 ### 5.3 多项目支持
@@ -710,8 +709,14 @@ pip install -r requirements.txt --break-system-packages
 
 **技术方案版本**: v1.0.0
 **评审状态**: 待评审
-**下次评审日期**: {datetime.now().strftime("%Y-%m-%d")}
-'''
+**下次评审日期**: $today
+''')
+
+def generate_tech_design_template(output_path: str, project_name: str = "新项目") -> str:
+    """生成技术方案文档模板（华安车险业务定制）"""
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    template = TECH_DESIGN_TEMPLATE.substitute(project_name=project_name, today=today)
     
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(template)
@@ -90,10 +90,16 @@ def get_field_name(df, logical_name):
 
     return None
 
+BOOLEAN_TRUE_VALUES = [True, 'True', '是', 'Y', 'yes', 1, '1']
+
 def normalize_boolean_field(series):
     """标准化布尔字段(True/False, 是/否等)"""
-    true_values = [True, 'True', '是', 'Y', 'yes', 1, '1']
-    return series.isin(true_values)
+    # 布尔/数值列直接做向量化比较，只有文本列才需要按取值集合匹配
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).astype(bool)
+    if pd.api.types.is_numeric_dtype(series):
+        return series == 1
+    return series.isin(BOOLEAN_TRUE_VALUES)
 
 def load_and_clean_data(file_path):
     """加载并清洗数据,自动检测格式"""
@@ -117,11 +123,21 @@ def load_and_clean_data(file_path):
     else:
         raise ValueError(f"不支持的文件格式: {file_ext}")
 
+    df = downcast_integer_columns(df)
+
     print(f"📊 数据行数: {len(df)}, 列数: {len(df.columns)}", file=sys.stderr)
     print(f"📋 列名: {list(df.columns[:10])}..." if len(df.columns) > 10 else f"📋 列名: {list(df.columns)}", file=sys.stderr)
 
     return df
 
+def downcast_integer_columns(df):
+    """件数等整数列无损降为最小整型，减少后续求和/分组扫描的字节数；
+    金额等浮点列保持 float64，避免汇总精度损失"""
+    int_cols = df.select_dtypes(include='int64').columns
+    if len(int_cols) > 0:
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast='integer')
+    return df
+
 def calculate_business_scale(df):
     """业务规模指标"""
     premium = get_field(df, 'premium')
@@ -130,18 +146,19 @@ def calculate_business_scale(df):
 
     # 检查保费字段单位(是否需要转换)
     premium_field_name = get_field_name(df, 'premium')
+    total_premium = premium.sum()
     if 'Ten Thousand' in premium_field_name:
-        premium_sum = premium.sum()  # 已经是万元
+        premium_sum = total_premium  # 已经是万元
         unit = "万元"
     else:
-        premium_sum = premium.sum() / 10000  # 转换为万元
+        premium_sum = total_premium / 10000  # 转换为万元
         unit = "万元(从元转换)"
 
     total_policies = policy_count.sum()
-    avg_premium = premium.sum() / total_policies if total_policies > 0 else 0
+    avg_premium = total_premium / total_policies if total_policies > 0 else 0
 
     # 业务类型分布
-    business_type_dist = df.groupby(business_type.name)[premium.name].sum().sort_values(ascending=False).head(5).to_dict()
+    business_type_dist = df.groupby(business_type.name)[premium.name].sum().nlargest(5).to_dict()
 
     return {
         '总保费_万元': round(premium_sum, 2),
@@ -157,9 +174,11 @@ def calculate_profitability(df):
     claim_amount = get_field(df, 'claim_amount')
     expense_amount = get_field(df, 'expense_amount')
 
-    total_premium = premium.sum()
-    total_claims = claim_amount.sum()
-    total_expense = expense_amount.sum()
+    # 三列一次性求和，取代逐列归约
+    totals = df[[premium.name, claim_amount.name, expense_amount.name]].sum()
+    total_premium = totals[premium.name]
+    total_claims = totals[claim_amount.name]
+    total_expense = totals[expense_amount.name]
 
     loss_ratio = (total_claims / total_premium * 100) if total_premium > 0 else 0
     expense_ratio = (total_expense / total_premium * 100) if total_premium > 0 else 0
@@ -189,19 +208,22 @@ def calculate_nev_insights(df):
         claim_amount = get_field(df, 'claim_amount')
         policy_count = get_field(df, 'policy_count')
 
-        nev_mask = is_nev
-        traditional_mask = ~is_nev
+        # 三列拼成一个二维数组，按新能源/传统车掩码各做一次按列归约，
+        # 替代逐列布尔索引再求和（空值按0计，与 Series.sum 一致）
+        values = np.nan_to_num(np.column_stack([
+            policy_count.to_numpy(dtype='float64', na_value=np.nan),
+            premium.to_numpy(dtype='float64', na_value=np.nan),
+            claim_amount.to_numpy(dtype='float64', na_value=np.nan)
+        ]))
+        nev_mask = is_nev.to_numpy()
 
-        nev_policies = policy_count[nev_mask].sum()
-        total_policies = policy_count.sum()
+        nev_policies, nev_premium, nev_claims = values[nev_mask].sum(axis=0)
+        total_policies = values[:, 0].sum()
 
         if nev_policies == 0:
             return {'新能源车数据': '无新能源车保单'}
 
-        nev_premium = premium[nev_mask].sum()
-        nev_claims = claim_amount[nev_mask].sum()
-        traditional_claims = claim_amount[traditional_mask].sum()
-        traditional_premium = premium[traditional_mask].sum()
+        _, traditional_premium, traditional_claims = values[~nev_mask].sum(axis=0)
 
         nev_loss_ratio = (nev_claims / nev_premium * 100) if nev_premium > 0 else 0
         traditional_loss_ratio = (traditional_claims / traditional_premium * 100) if traditional_premium > 0 else 0
@@ -223,9 +245,10 @@ def calculate_risk_metrics(df):
         policy_count = get_field(df, 'policy_count')
         claim_amount = get_field(df, 'claim_amount')
 
-        total_policies = policy_count.sum()
-        total_claims = claim_cases.sum()
-        total_claim_amount = claim_amount.sum()
+        totals = df[[policy_count.name, claim_cases.name, claim_amount.name]].sum()
+        total_policies = totals[policy_count.name]
+        total_claims = totals[claim_cases.name]
+        total_claim_amount = totals[claim_amount.name]
 
         claim_frequency = (total_claims / total_policies * 100) if total_policies > 0 else 0
         avg_claim_amount = (total_claim_amount / total_claims) if total_claims > 0 else 0
@@ -255,10 +278,10 @@ def calculate_customer_mix(df):
         renewal_rate = (renewal_policies / total_policies * 100) if total_policies > 0 else 0
 
         # 客户类别分布
-        customer_dist = df.groupby(customer_category.name)[premium.name].sum().sort_values(ascending=False).head(5).to_dict()
+        customer_dist = df.groupby(customer_category.name)[premium.name].sum().nlargest(5).to_dict()
 
         # 三级机构贡献
-        org_contrib = df.groupby(third_level_org.name)[premium.name].sum().sort_values(ascending=False).head(5).to_dict()
+        org_contrib = df.groupby(third_level_org.name)[premium.name].sum().nlargest(5).to_dict()
 
         return {
             '续保率_%': round(renewal_rate, 2),
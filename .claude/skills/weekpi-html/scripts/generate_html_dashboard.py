@@ -7,16 +7,106 @@
 import sys
 import os
 import json
+import gzip
+import codecs
+import pickle
+import hashlib
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# 可选依赖：pyarrow（多线程CSV解析）
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 可选依赖：polars（大文件预聚合时多线程流式扫描CSV）
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# 可选依赖：orjson（嵌入页面的数据JSON序列化更快，输出同为紧凑UTF-8）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 可选依赖：rcssmin（导入时压缩内嵌样式表）
+try:
+    import rcssmin
+    RCSSMIN_AVAILABLE = True
+except ImportError:
+    RCSSMIN_AVAILABLE = False
+
+# 可选依赖：brotli（--gzip 时额外输出压缩率更高的 .html.br）
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 聚合结果缓存目录；聚合逻辑变化时递增版本号使旧缓存失效
+CACHE_DIR = Path.home() / '.cache' / 'weekpi-html'
+CACHE_VERSION = 2
+# 数据文件摘要索引：路径 -> [大小, 修改时间(ns), SHA-256]，文件未改动时免去整文件哈希
+DIGEST_INDEX_PATH = CACHE_DIR / 'file_digests.json'
+
+# 原始CSV格式按维度聚合时求和的金额/件数字段（各维度共用同一份聚合规则）
+RAW_SUM_AGG = {
+    'signed_premium_yuan': 'sum',
+    'matured_premium_yuan': 'sum',
+    'reported_claim_payment_yuan': 'sum',
+    'expense_amount_yuan': 'sum',
+    'policy_count': 'sum',
+    'claim_case_count': 'sum'
+}
+
+# 两种数据格式各自在聚合阶段用到的字段，加载前按表头一次性校验
+RAW_REQUIRED_FIELDS = ['third_level_organization', 'customer_category_3'] + list(RAW_SUM_AGG)
+PROCESSED_REQUIRED_FIELDS = ['机构', '客户类别', '签单保费', '满期赔付率', '费用率', '变动成本率',
+                             '已报告赔款', '出险率', '案均赔款']
+
+def safe_divide_array(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+    """向量化安全除法：分母不大于0（含空值）时结果为0"""
+    num = numerator.to_numpy(dtype='float64', na_value=np.nan)
+    denom = denominator.to_numpy(dtype='float64', na_value=np.nan)
+    return np.divide(num, denom, out=np.zeros(len(num)), where=denom > 0)
+
+def dumps_compact(data: Any) -> str:
+    """序列化为紧凑JSON（中文不转义、无多余空白），有 orjson 时优先使用"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), check_circular=False)
+
+# 超过该大小的原始格式CSV分块读取并预聚合，内存占用与维度组合数相关而与行数无关
+CSV_STREAM_THRESHOLD_BYTES = 512 * 1024 * 1024
+CSV_CHUNK_ROWS = 500_000
+
+# 单个图表最多展示的维度条目数，超出部分合并为“其他”
+MAX_CHART_ITEMS = 20
+
+# 嵌入页面的图表数据浮点精度（问题机构识别在Python端按完整精度完成）
+CHART_FLOAT_DIGITS = 4
+
+# 分组维度字段（原始/预处理两种格式），加载后转为 category 以便按整数编码分组
+GROUP_KEY_FIELDS = ('third_level_organization', 'customer_category_3', '机构', '客户类别')
+
+# 写出HTML时的文件缓冲区大小，内嵌库与数据的大片段可整块落盘，减少系统调用次数
+HTML_WRITE_BUFFER_BYTES = 256 * 1024
+
 class HTMLDashboardGenerator:
     """HTML仪表盘生成器"""
 
-    def __init__(self, data_file: str, week: int, organization: str, config_dir: str):
+    def __init__(self, data_file: str, week: int, organization: str, config_dir: str,
+                 use_cache: bool = True):
         """
         初始化生成器
 
@@ -25,27 +115,110 @@ class HTMLDashboardGenerator:
             week: 周次
             organization: 机构名称
             config_dir: 配置文件目录
+            use_cache: 是否复用同一数据文件的聚合结果缓存
         """
         self.data_file = data_file
         self.week = week
         self.organization = organization
         self.config_dir = Path(config_dir)
 
-        # 加载数据
-        self.df = self._load_data()
-
         # 加载配置
         self.thresholds = self._load_config('thresholds.json')
         self.plans = self._load_config('plans.json', required=False)
 
+        # 数据文件与计划配置未变时直接复用上次的聚合结果，跳过读取和分组
+        cache_path = self._cache_path() if use_cache else None
+        cached = self._read_cache(cache_path)
+        if cached is not None:
+            print("✓ 数据文件未变化，复用缓存的聚合结果")
+            self.df = None
+            self.data_by_org = cached['data_by_org']
+            self.data_by_category = cached['data_by_category']
+            self.summary = cached['summary']
+            return
+
+        # 加载数据
+        self.df = self._load_data()
+
         # 检测数据格式并选择正确的字段名
         is_raw = 'signed_premium_yuan' in self.df.columns
         org_field = 'third_level_organization' if is_raw else '机构'
         category_field = 'customer_category_3' if is_raw else '客户类别'
 
-        # 计算聚合数据
-        self.data_by_org = self._aggregate_by_dimension(org_field)
-        self.data_by_category = self._aggregate_by_dimension(category_field)
+        # 计算聚合数据（三项聚合互不依赖且只读self.df，pandas计算期间释放GIL，并行执行）
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            org_future = executor.submit(self._aggregate_by_dimension, org_field)
+            category_future = executor.submit(self._aggregate_by_dimension, category_field)
+            summary_future = executor.submit(self._calculate_summary_metrics)
+            self.data_by_org = org_future.result()
+            self.data_by_category = category_future.result()
+            self.summary = summary_future.result()
+
+        if cache_path is not None:
+            self._write_cache(cache_path, {
+                'data_by_org': self.data_by_org,
+                'data_by_category': self.data_by_category,
+                'summary': self.summary
+            })
+
+    def _cache_path(self) -> Path:
+        """按数据文件内容和计划配置计算缓存文件路径"""
+        digest = hashlib.sha256(self._data_file_digest().encode('ascii'))
+        digest.update(json.dumps(self.plans, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        return CACHE_DIR / f"v{CACHE_VERSION}_{digest.hexdigest()}.pkl"
+
+    def _data_file_digest(self) -> str:
+        """数据文件内容的SHA-256；文件大小与修改时间均未变时复用上次记录的摘要，不再整文件读取"""
+        stat = os.stat(self.data_file)
+        key = os.path.abspath(self.data_file)
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        try:
+            with open(DIGEST_INDEX_PATH, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        entry = index.get(key)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+
+        digest = hashlib.sha256()
+        with open(self.data_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        # 每个路径只保留最新一条记录
+        index[key] = stamp + [digest.hexdigest()]
+        try:
+            DIGEST_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = DIGEST_INDEX_PATH.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(tmp_path, DIGEST_INDEX_PATH)
+        except OSError as e:
+            print(f"警告: 文件摘要索引写入失败: {e}")
+        return index[key][2]
+
+    @staticmethod
+    def _read_cache(cache_path: Optional[Path]) -> Optional[Dict]:
+        """读取聚合结果缓存，不存在或损坏时返回None"""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: Path, payload: Dict):
+        """写入聚合结果缓存（先写临时文件再替换，避免并发读到半截文件）"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"警告: 聚合结果缓存写入失败: {e}")
 
     def _load_data(self) -> pd.DataFrame:
         """加载数据文件"""
@@ -54,9 +227,21 @@ class HTMLDashboardGenerator:
         if file_ext in ['.xlsx', '.xls']:
             df = pd.read_excel(self.data_file)
         elif file_ext == '.csv':
-            df = pd.read_csv(self.data_file, encoding='utf-8')
+            # 先只读表头校验字段，缺字段时在解析全量数据之前就报错
+            self._detect_format(pd.read_csv(self.data_file, encoding='utf-8', nrows=0).columns)
+            df = None
+            if os.path.getsize(self.data_file) > CSV_STREAM_THRESHOLD_BYTES:
+                df = self._read_csv_preaggregated()
+            if df is None:
+                # pyarrow引擎多线程解析，未安装时回退到默认C解析器
+                engine = 'pyarrow' if PYARROW_AVAILABLE else None
+                df = pd.read_csv(self.data_file, encoding='utf-8', engine=engine)
         elif file_ext == '.json':
             df = pd.read_json(self.data_file)
+        elif file_ext == '.parquet':
+            df = pd.read_parquet(self.data_file)
+        elif file_ext in ['.arrow', '.feather']:
+            df = pd.read_feather(self.data_file)
         elif file_ext in ['.db', '.duckdb']:
             import duckdb
             conn = duckdb.connect(self.data_file)
@@ -65,33 +250,109 @@ class HTMLDashboardGenerator:
         else:
             raise ValueError(f"不支持的文件格式: {file_ext}")
 
-        # 检测数据格式类型
-        # 类型1: 原始CSV（包含金额字段）- 推荐
-        # 类型2: 预处理CSV（包含已计算的比率）- 兼容旧数据
-
-        raw_fields = ['signed_premium_yuan', 'matured_premium_yuan',
-                      'reported_claim_payment_yuan', 'expense_amount_yuan']
-        processed_fields = ['机构', '客户类别', '签单保费', '满期赔付率']
-
-        is_raw_format = all(f in df.columns for f in raw_fields)
-        is_processed_format = all(f in df.columns for f in processed_fields)
-
-        if is_raw_format:
+        if self._detect_format(df.columns):
             print("✓ 检测到原始CSV格式，将使用标准KPI计算公式")
             # 不需要额外处理，在聚合时会正确计算
-            return df
-        elif is_processed_format:
-            print("⚠️ 检测到预处理CSV格式（可能存在KPI计算误差）")
-            return df
+            return self._categorize_group_keys(self._downcast_numeric(df))
         else:
-            available = list(df.columns)
-            raise ValueError(
-                f"无法识别数据格式。\n"
-                f"期望格式1（原始CSV）: {raw_fields}\n"
-                f"期望格式2（预处理CSV）: {processed_fields}\n"
-                f"实际字段: {available}"
-            )
+            print("⚠️ 检测到预处理CSV格式（可能存在KPI计算误差）")
+            return self._categorize_group_keys(df)
+
+    @staticmethod
+    def _detect_format(columns) -> bool:
+        """
+        检测数据格式类型，返回是否为原始格式；两种格式的字段都不齐全时抛出ValueError
+
+        类型1: 原始CSV（包含金额字段）- 推荐
+        类型2: 预处理CSV（包含已计算的比率）- 兼容旧数据
+        """
+        if all(f in columns for f in RAW_REQUIRED_FIELDS):
+            return True
+        if all(f in columns for f in PROCESSED_REQUIRED_FIELDS):
+            return False
+
+        available = list(columns)
+        raise ValueError(
+            f"无法识别数据格式。\n"
+            f"期望格式1（原始CSV）: {RAW_REQUIRED_FIELDS}\n"
+            f"期望格式2（预处理CSV）: {PROCESSED_REQUIRED_FIELDS}\n"
+            f"缺少字段（格式1）: {[f for f in RAW_REQUIRED_FIELDS if f not in columns]}\n"
+            f"缺少字段（格式2）: {[f for f in PROCESSED_REQUIRED_FIELDS if f not in columns]}\n"
+            f"实际字段: {available}"
+        )
 
+    def _read_csv_preaggregated(self) -> Optional[pd.DataFrame]:
+        """
+        分块读取大体积原始格式CSV，按(机构, 客户类别)逐块求和后合并
+
+        原始格式的维度聚合和汇总指标只用到金额/件数之和，预聚合结果与全量读取等价；
+        预处理格式需要对比率求均值，无法预聚合，返回None由调用方全量读取
+        """
+        columns = pd.read_csv(self.data_file, encoding='utf-8', nrows=0).columns
+        keys = ['third_level_organization', 'customer_category_3']
+        if not all(f in columns for f in keys + list(RAW_SUM_AGG)):
+            return None
+
+        sum_fields = list(RAW_SUM_AGG)
+        if 'premium_plan_yuan' in columns:
+            sum_fields.append('premium_plan_yuan')
+
+        # polars 惰性扫描CSV并多线程分组求和（转回pandas依赖pyarrow）；
+        # 字段类型与声明不符等解析错误时回退到pandas分块读取
+        if POLARS_AVAILABLE and PYARROW_AVAILABLE:
+            try:
+                return self._preaggregate_with_polars(keys, sum_fields)
+            except pl.exceptions.PolarsError as e:
+                print(f"警告: polars预聚合失败，改用pandas分块读取: {str(e).splitlines()[0]}")
+
+        # dropna=False 保留维度为空的行，使汇总指标仍覆盖全部记录
+        partials = [
+            chunk.groupby(keys, dropna=False, sort=False)[sum_fields].sum()
+            for chunk in pd.read_csv(self.data_file, encoding='utf-8', usecols=keys + sum_fields,
+                                     chunksize=CSV_CHUNK_ROWS)
+        ]
+        print(f"✓ 大文件分块预聚合完成（{len(partials)} 块）")
+        return pd.concat(partials).groupby(level=keys, dropna=False, sort=False).sum().reset_index()
+
+    def _preaggregate_with_polars(self, keys: List[str], sum_fields: List[str]) -> pd.DataFrame:
+        """用polars流式扫描CSV，按维度组合求和（空维度值单独成组，与pandas的dropna=False一致）"""
+        count_fields = {'policy_count', 'claim_case_count'}
+        schema = {key: pl.Utf8 for key in keys}
+        schema.update({f: pl.Int64 if f in count_fields else pl.Float64 for f in sum_fields})
+
+        grouped = (
+            pl.scan_csv(self.data_file, schema_overrides=schema)
+            .select(keys + sum_fields)
+            .group_by(keys)
+            .agg(pl.col(sum_fields).sum())
+            .collect()
+        )
+        print(f"✓ 大文件预聚合完成（polars，{grouped.height} 个维度组合）")
+        return grouped.to_pandas()
+
+    @staticmethod
+    def _categorize_group_keys(df: pd.DataFrame) -> pd.DataFrame:
+        """将分组维度字段转为 category，重复取值只需哈希一次"""
+        for col in GROUP_KEY_FIELDS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        return df
+
+    @staticmethod
+    def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+        """将取值范围允许的整数件数字段降为 int32，减少后续聚合扫描的字节数
+
+        金额字段保持 float64：单值转 float32 即使无损，分组求和也会以 float32 累加而丢失精度。
+        int32 列分组求和时 pandas 以 int64 累加，不会溢出。
+        """
+        int32 = np.iinfo(np.int32)
+        for col in RAW_SUM_AGG:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            if values.dtype == np.int64:
+                if len(values) and int32.min <= values.min() and values.max() <= int32.max:
+                    df[col] = values.astype(np.int32)
         return df
 
     def _load_config(self, filename: str, required: bool = True) -> Optional[Dict]:
@@ -136,14 +397,11 @@ class HTMLDashboardGenerator:
 
         if is_raw:
             # 原始CSV格式：先聚合金额，再计算比率（标准KPI计算方法）
-            grouped = self.df.groupby(dimension).agg({
-                'signed_premium_yuan': 'sum',
-                'matured_premium_yuan': 'sum',
-                'reported_claim_payment_yuan': 'sum',
-                'expense_amount_yuan': 'sum',
-                'policy_count': 'sum',
-                'claim_case_count': 'sum'
-            }).reset_index()
+            # 保费计划字段与金额字段在同一次分组中求和，避免为计划数据再分组一次
+            agg_spec = dict(RAW_SUM_AGG)
+            if 'premium_plan_yuan' in self.df.columns:
+                agg_spec['premium_plan_yuan'] = 'sum'
+            grouped = self.df.groupby(dimension, observed=True).agg(agg_spec).reset_index()
 
             # 重命名为中文（保持兼容性）
             rename_dict = {
@@ -162,28 +420,16 @@ class HTMLDashboardGenerator:
             if original_dimension in rename_dict:
                 dimension = rename_dict[original_dimension]
 
-            # 安全除法函数
-            def safe_divide(num, denom):
-                return (num / denom) if denom > 0 else 0
-
-            # 按标准KPI公式计算比率
-            grouped['满期赔付率'] = grouped.apply(
-                lambda x: safe_divide(x['已报告赔款'], x['满期保费']) * 100, axis=1
-            )
-            grouped['费用率'] = grouped.apply(
-                lambda x: safe_divide(x['费用额'], x['签单保费']) * 100, axis=1
-            )
+            # 按标准KPI公式计算比率（整列向量化计算）
+            grouped['满期赔付率'] = safe_divide_array(grouped['已报告赔款'], grouped['满期保费']) * 100
+            grouped['费用率'] = safe_divide_array(grouped['费用额'], grouped['签单保费']) * 100
             grouped['变动成本率'] = grouped['满期赔付率'] + grouped['费用率']
-            grouped['出险率'] = grouped.apply(
-                lambda x: safe_divide(x['赔案件数'], x['保单件数']) * 100, axis=1
-            )
-            grouped['案均赔款'] = grouped.apply(
-                lambda x: safe_divide(x['已报告赔款'], x['赔案件数']), axis=1
-            )
+            grouped['出险率'] = safe_divide_array(grouped['赔案件数'], grouped['保单件数']) * 100
+            grouped['案均赔款'] = safe_divide_array(grouped['已报告赔款'], grouped['赔案件数'])
 
         else:
             # 预处理CSV格式（兼容旧数据，但可能不准确）
-            grouped = self.df.groupby(dimension).agg({
+            grouped = self.df.groupby(dimension, observed=True).agg({
                 '签单保费': 'sum',
                 '满期赔付率': 'mean',  # ⚠️ 简单平均，可能不准确
                 '费用率': 'mean',
@@ -203,42 +449,59 @@ class HTMLDashboardGenerator:
 
         # 计算年计划达成率（优先使用原始数据中的保费计划字段）
         if is_raw and 'premium_plan_yuan' in self.df.columns:
-            # 使用original_dimension聚合计划数据
-            plan_data = self.df.groupby(original_dimension).agg({
-                'premium_plan_yuan': 'sum'
-            }).reset_index()
-
-            # 重命名为中文字段（与grouped保持一致）
-            rename_dict = {
-                'third_level_organization': '机构',
-                'customer_category_3': '客户类别'
-            }
-
-            if original_dimension in rename_dict:
-                plan_data.rename(columns={original_dimension: rename_dict[original_dimension]}, inplace=True)
-                dim_name = rename_dict[original_dimension]
-            else:
-                dim_name = original_dimension
-
-            # 合并计划数据（此时grouped已经被重命名了，使用重命名后的dimension）
-            grouped = grouped.merge(plan_data, on=dim_name, how='left')
-            grouped['年计划达成率'] = grouped.apply(
-                lambda x: (x['签单保费'] / x['premium_plan_yuan'] * 100) if x.get('premium_plan_yuan', 0) > 0 else None,
-                axis=1
-            )
+            # 计划数据已在上面的分组聚合中一并求和
+            plan = grouped['premium_plan_yuan']
+            rate = grouped['签单保费'] / plan * 100
+            grouped['年计划达成率'] = rate.astype(object).where(plan > 0, None)
         elif self.plans and '年度保费计划' in self.plans:
             # 使用配置文件中的计划数据
-            grouped['年计划达成率'] = grouped.apply(
-                lambda x: (x['签单保费'] / self.plans['年度保费计划'].get(x[dimension], 1)) * 100
-                if x[dimension] in self.plans['年度保费计划'] else None,
-                axis=1
-            )
+            plan = grouped[dimension].astype(object).map(self.plans['年度保费计划'])
+            rate = grouped['签单保费'] / plan.astype('float64') * 100
+            grouped['年计划达成率'] = rate.astype(object).where(plan.notna(), None)
         else:
             # 没有计划数据，设置为None
             grouped['年计划达成率'] = None
 
         return grouped.to_dict('records')
 
+    @staticmethod
+    def _limit_chart_items(records: List[Dict], dimension: str,
+                           limit: int = MAX_CHART_ITEMS) -> List[Dict]:
+        """维度条目过多时保留签单保费前N项，其余合并为“其他(N项)”，避免图表条目过多"""
+        if len(records) <= limit:
+            return records
+
+        # 前N项直接取原始记录，不经 DataFrame 往返（否则 None 会变成 NaN 写进图表 JSON）
+        df = pd.DataFrame(records)
+        top_index = df.nlargest(limit, '签单保费').index.sort_values()
+        rest = df.drop(top_index)
+
+        def ratio(num, denom):
+            return float(num / denom) if denom > 0 else 0.0
+
+        other = {dimension: f"其他({len(rest)}项)"}
+        for col in ('签单保费', '满期保费', '已报告赔款', '费用额', '保单件数', '赔案件数',
+                    'premium_plan_yuan', '保费占比', '已报告赔款占比'):
+            if col in rest.columns:
+                other[col] = rest[col].sum().item()
+
+        if '满期保费' in rest.columns:
+            # 原始格式：用合并后的金额按标准公式重算比率
+            other['满期赔付率'] = ratio(other['已报告赔款'], other['满期保费']) * 100
+            other['费用率'] = ratio(other['费用额'], other['签单保费']) * 100
+            other['变动成本率'] = other['满期赔付率'] + other['费用率']
+            other['出险率'] = ratio(other['赔案件数'], other['保单件数']) * 100
+            other['案均赔款'] = ratio(other['已报告赔款'], other['赔案件数'])
+        else:
+            # 预处理格式：比率按签单保费加权平均
+            for col in ('满期赔付率', '费用率', '变动成本率', '出险率', '案均赔款'):
+                other[col] = ratio((rest[col] * rest['签单保费']).sum(), other['签单保费'])
+
+        plan = other.get('premium_plan_yuan', 0)
+        other['年计划达成率'] = other['签单保费'] / plan * 100 if plan > 0 else None
+
+        return [records[i] for i in top_index] + [other]
+
     def _calculate_summary_metrics(self) -> Dict:
         """计算汇总指标"""
         # 检测数据格式
@@ -319,26 +582,30 @@ class HTMLDashboardGenerator:
 
         return problems[:5]  # 最多返回5个问题机构
 
-    def generate_html(self, output_path: Optional[str] = None) -> str:
+    def generate_html(self, output_path: Optional[str] = None, compress: bool = False,
+                      external_js: bool = False, external_data: bool = False) -> str:
         """
         生成HTML仪表盘
 
         Args:
             output_path: 输出文件路径（可选）
+            compress: 是否同时输出gzip压缩的 .html.gz（便于网络分发）
+            external_js: 是否将图表脚本写为同目录的 dashboard.js 并在页面中引用（页面不再单文件自包含）
+            external_data: 是否将图表数据写为同名的 .data.js 并在页面中引用（页面不再单文件自包含）
 
         Returns:
             生成的HTML文件路径
         """
         # 准备数据
-        summary = self._calculate_summary_metrics()
+        summary = self.summary
         problems = self._identify_problem_orgs()
 
-        # 生成HTML内容
-        html_content = self._build_html_template(
+        # 生成HTML片段（问题机构已按完整数据识别，图表数据再做条目合并）
+        html_parts = self._build_html_template(
             summary=summary,
             problems=problems,
-            data_by_org=self.data_by_org,
-            data_by_category=self.data_by_category,
+            data_by_org=self._limit_chart_items(self.data_by_org, '机构'),
+            data_by_category=self._limit_chart_items(self.data_by_category, '客户类别'),
             thresholds=self.thresholds
         )
 
@@ -347,11 +614,44 @@ class HTMLDashboardGenerator:
             timestamp = datetime.now().strftime('%Y%m%d')
             output_path = f"车险第{self.week}周经营分析_{self.organization}_{timestamp}.html"
 
-        # 写入文件（使用UTF-8 BOM避免浏览器乱码）
-        with open(output_path, 'w', encoding='utf-8-sig') as f:
-            f.write(html_content)
+        # 默认模板的最后三段依次为：标签页结构、数据JSON、图表脚本
+        if external_js and html_parts[-1] is DASHBOARD_SCRIPT:
+            html_parts[-1] = DASHBOARD_EXTERNAL_SCRIPT
+            self._write_dashboard_js(Path(output_path).parent / DASHBOARD_JS_FILENAME)
+
+        if external_data and html_parts[-3] is DASHBOARD_LAYOUT:
+            # 数据以脚本文件形式外置（本地直接打开HTML时 fetch 读取不了同目录文件，<script src> 可以）；
+            # 页面在主脚本之前同步加载它，主脚本改为读取其设置的全局变量
+            data_path = Path(output_path).with_suffix('.data.js')
+            with open(data_path, 'w', encoding='utf-8') as f:
+                f.writelines(('window.DASHBOARD_DATA = ', html_parts[-2], ';\n'))
+            html_parts[-2] = 'window.DASHBOARD_DATA'
+            html_parts.insert(-3, f'<script src="{data_path.name}"></script>')
+            print(f"✅ 图表数据: {data_path}")
+
+        # 各片段只编码一次（UTF-8 BOM避免浏览器乱码），HTML与压缩文件共用同一组字节片段；
+        # 以二进制逐段写入，不在内存中拼出整页，也不经过文本IO层的逐次编码
+        encoded_parts = [codecs.BOM_UTF8] + [part.encode('utf-8') for part in html_parts]
+        with open(output_path, 'wb', buffering=HTML_WRITE_BUFFER_BYTES) as f:
+            f.writelines(encoded_parts)
 
         print(f"✅ HTML仪表盘生成成功: {output_path}")
+
+        if compress:
+            # 内嵌ECharts库与数据的单文件HTML压缩率很高，服务端以 Content-Encoding: gzip 提供即可
+            gz_path = f"{output_path}.gz"
+            with gzip.open(gz_path, 'wb', compresslevel=6) as f:
+                f.writelines(encoded_parts)
+            print(f"✅ 压缩文件: {gz_path} ({os.path.getsize(gz_path) / 1024:,.0f} KB)")
+            if BROTLI_AVAILABLE:
+                # 静态服务器可直接以 Content-Encoding: br 提供预压缩文件；逐段压缩，不拼接整页
+                br_path = f"{output_path}.br"
+                compressor = brotli.Compressor(quality=5)
+                with open(br_path, 'wb') as f:
+                    for chunk in encoded_parts:
+                        f.write(compressor.process(chunk))
+                    f.write(compressor.finish())
+                print(f"✅ 压缩文件: {br_path} ({os.path.getsize(br_path) / 1024:,.0f} KB)")
         print(f"📊 数据概览: 签单保费 {summary['签单保费']:,.0f}元, 变动成本率 {summary['变动成本率']}%")
 
         if problems:
@@ -359,8 +659,16 @@ class HTMLDashboardGenerator:
 
         return output_path
 
-    def _build_html_template(self, **data) -> str:
-        """构建HTML模板"""
+    @staticmethod
+    def _write_dashboard_js(js_path: Path):
+        """写出外置图表脚本；已存在且内容一致时跳过，脚本更新后自动覆盖旧文件"""
+        if js_path.exists() and js_path.read_text(encoding='utf-8') == DASHBOARD_SCRIPT_JS:
+            return
+        js_path.write_text(DASHBOARD_SCRIPT_JS, encoding='utf-8')
+        print(f"✅ 图表脚本: {js_path}")
+
+    def _build_html_template(self, **data) -> List[str]:
+        """构建HTML模板，按顺序返回各HTML片段"""
         # 读取模板文件
         template_path = Path(__file__).parent.parent / 'assets' / 'templates' / 'dashboard.html'
 
@@ -368,8 +676,13 @@ class HTMLDashboardGenerator:
             with open(template_path, 'r', encoding='utf-8') as f:
                 template = f.read()
 
-            # 使用简单的字符串替换（如果模板存在）
-            return template.replace('{{DATA}}', json.dumps(data, ensure_ascii=False))
+            # 使用简单的占位符替换（如果模板存在）：在各占位符处插入数据片段
+            data_json = dumps_compact(data)
+            segments = template.split('{{DATA}}')
+            parts = [segments[0]]
+            for segment in segments[1:]:
+                parts.extend((data_json, segment))
+            return parts
 
         # 如果模板不存在，生成默认HTML
         return self._generate_default_html(**data)
@@ -387,50 +700,140 @@ class HTMLDashboardGenerator:
             except Exception:
                 pass
 
-        # 2. 尝试联网下载
+        # 2. 尝试联网下载，成功后保存到本地 assets，之后的生成直接读取本地副本
         try:
             import urllib.request
             # 设置超时时间，避免长时间阻塞
             with urllib.request.urlopen(echarts_url, timeout=3) as response:
                 content = response.read().decode('utf-8')
-                return f"<script>{content}</script>"
         except Exception:
-            pass
+            content = None
+
+        if content:
+            try:
+                local_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(local_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            except OSError:
+                pass
+            return f"<script>{content}</script>"
             
         # 3. 失败则回退到 CDN
         return f'<script src="{echarts_url}"></script>'
 
     def _generate_default_html(self, summary: Dict, problems: List[str],
                                 data_by_org: List[Dict], data_by_category: List[Dict],
-                                thresholds: Dict) -> str:
-        """生成默认HTML（内嵌模板）"""
+                                thresholds: Dict) -> List[str]:
+        """生成默认HTML（内嵌模板），按顺序返回各HTML片段"""
 
-        # 转换数据为JSON
-        data_json = json.dumps({
+        # 转换数据为JSON（数据只供脚本读取，不缩进并使用紧凑分隔符以减小页面体积）
+        data_json = dumps_compact({
             'summary': summary,
             'problems': problems,
-            'dataByOrg': data_by_org,
-            'dataByCategory': data_by_category,
+            'dataByOrg': self._to_columnar(data_by_org),
+            'dataByCategory': self._to_columnar(data_by_category),
             'thresholds': thresholds,
             'week': self.week,
             'organization': self.organization
-        }, ensure_ascii=False, indent=2)
+        })
 
-        html = f"""<!DOCTYPE html>
+        head = f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>华安保险车险第{self.week}周经营分析 - {self.organization}</title>
-    {self._download_echarts()}
-    <style>
-        * {{
+    """
+
+        body = f"""</head>
+<body>
+    <div class="header">
+        <h1>华安保险车险第{self.week}周经营分析</h1>
+        <div class="header-info">
+            {self.organization} | {datetime.now().strftime('%Y年%m月%d日')}
+        </div>
+    </div>
+
+"""
+
+        # 指标卡片（含本期汇总数值）
+        metric_cards = f"""                <div class="metric-card">
+                    <div class="metric-label">签单保费</div>
+                    <div class="metric-value">{int(summary['签单保费']/10000)}<span class="metric-unit">万元</span></div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">变动成本率</div>
+                    <div class="metric-value status-{self._get_status(summary['变动成本率'], 'cost')}">{summary['变动成本率']:.1f}<span class="metric-unit">%</span></div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">满期赔付率</div>
+                    <div class="metric-value">{summary['满期赔付率']:.1f}<span class="metric-unit">%</span></div>
+                </div>
+                <div class="metric-card">
+                    <div class="metric-label">费用率</div>
+                    <div class="metric-value">{summary['费用率']:.1f}<span class="metric-unit">%</span></div>
+                </div>
+            </div>
+
+            """
+
+        # ECharts库与数据作为独立片段返回，由调用方依次写出，不再拼接成一个大字符串
+        # 问题列表仅在有问题机构时插入，其余静态结构直接复用模块级常量
+        parts = [head, self._download_echarts(), DASHBOARD_STYLE, body, DASHBOARD_TABS, metric_cards]
+        if problems:
+            parts.append(self._render_problem_list(problems))
+        parts.extend((DASHBOARD_LAYOUT, data_json, DASHBOARD_SCRIPT))
+        return parts
+
+    @staticmethod
+    def _to_columnar(records: List[Dict]) -> Dict:
+        """记录列表转为按列存储：字段名只出现一次，每条记录只保留取值（缺失字段为null）；
+        浮点数保留 CHART_FLOAT_DIGITS 位小数（页面最多显示1位），避免输出17位有效数字"""
+        columns = list(dict.fromkeys(key for record in records for key in record))
+
+        def compact(value):
+            return round(value, CHART_FLOAT_DIGITS) if isinstance(value, float) else value
+
+        return {
+            'columns': columns,
+            'rows': [[compact(record.get(col)) for col in columns] for record in records]
+        }
+
+    def _get_status(self, value: float, metric_type: str) -> str:
+        """获取指标状态"""
+        if metric_type == 'cost':
+            if value < 85:
+                return 'good'
+            elif value < 95:
+                return 'warning'
+            else:
+                return 'danger'
+        return 'good'
+
+    def _render_problem_list(self, problems: List[str]) -> str:
+        """渲染问题列表"""
+        if not problems:
+            return ""
+
+        items = ''.join([f"<li>• {p}</li>" for p in problems])
+        return f"""
+        <div class="problem-list">
+            <h3>⚠️ 需要关注的问题</h3>
+            <ul>{items}</ul>
+        </div>
+        """
+
+
+# ============ 仪表盘静态资源 ============
+# 样式表不含任何变量，作为普通字符串在导入时生成一次；不再放在 f-string 中逐次求值，也无需转义花括号
+DASHBOARD_CSS = """
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        :root {{
+        :root {
             --primary-red: #a02724;
             --success-green: #00b050;
             --warning-yellow: #ffc000;
@@ -447,17 +850,17 @@ class HTMLDashboardGenerator:
             --border-radius: 12px;
             --border-radius-sm: 8px;
             --transition: all 0.25s cubic-bezier(0.4, 0, 0.2, 1);
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Microsoft YaHei', 'PingFang SC', Arial, sans-serif;
             background: linear-gradient(135deg, #f5f7fa 0%, #e8ebef 100%);
             color: var(--gray-dark);
             -webkit-font-smoothing: antialiased;
             -moz-osx-font-smoothing: grayscale;
-        }}
+        }
 
-        .header {{
+        .header {
             background: rgba(255, 255, 255, 0.85);
             backdrop-filter: var(--blur-backdrop);
             -webkit-backdrop-filter: var(--blur-backdrop);
@@ -467,23 +870,23 @@ class HTMLDashboardGenerator:
             position: sticky;
             top: 0;
             z-index: 100;
-        }}
+        }
 
-        .header h1 {{
+        .header h1 {
             font-size: 28px;
             font-weight: 600;
             color: var(--primary-red);
             margin-bottom: 8px;
             letter-spacing: -0.5px;
-        }}
+        }
 
-        .header-info {{
+        .header-info {
             font-size: 13px;
             color: var(--gray-medium);
             font-weight: 400;
-        }}
+        }
 
-        .tabs {{
+        .tabs {
             background: rgba(255, 255, 255, 0.75);
             backdrop-filter: var(--blur-backdrop);
             -webkit-backdrop-filter: var(--blur-backdrop);
@@ -494,9 +897,9 @@ class HTMLDashboardGenerator:
             position: sticky;
             top: 76px;
             z-index: 99;
-        }}
+        }
 
-        .tab {{
+        .tab {
             padding: 14px 20px;
             cursor: pointer;
             border-bottom: 2px solid transparent;
@@ -506,34 +909,34 @@ class HTMLDashboardGenerator:
             font-weight: 400;
             border-radius: 6px 6px 0 0;
             position: relative;
-        }}
+        }
 
-        .tab:hover {{
+        .tab:hover {
             background: rgba(160, 39, 36, 0.05);
             color: var(--gray-dark);
-        }}
+        }
 
-        .tab.active {{
+        .tab.active {
             color: var(--primary-red);
             border-bottom-color: var(--primary-red);
             font-weight: 500;
             background: rgba(255, 255, 255, 0.9);
-        }}
+        }
 
-        .content {{
+        .content {
             max-width: 1400px;
             margin: 30px auto;
             padding: 0 40px;
-        }}
+        }
 
-        .metric-cards {{
+        .metric-cards {
             display: grid;
             grid-template-columns: repeat(4, 1fr);
             gap: 16px;
             margin-bottom: 24px;
-        }}
+        }
 
-        .metric-card {{
+        .metric-card {
             background: rgba(255, 255, 255, 0.95);
             backdrop-filter: blur(10px);
             -webkit-backdrop-filter: blur(10px);
@@ -542,14 +945,14 @@ class HTMLDashboardGenerator:
             box-shadow: var(--card-shadow);
             transition: var(--transition);
             border: 1px solid rgba(0,0,0,0.04);
-        }}
+        }
 
-        .metric-card:hover {{
+        .metric-card:hover {
             box-shadow: var(--card-shadow-hover);
             transform: translateY(-2px);
-        }}
+        }
 
-        .metric-label {{
+        .metric-label {
             font-size: 13px;
             color: var(--gray-medium);
             margin-bottom: 12px;
@@ -557,37 +960,37 @@ class HTMLDashboardGenerator:
             letter-spacing: 0.3px;
             text-transform: uppercase;
             opacity: 0.8;
-        }}
+        }
 
-        .metric-value {{
+        .metric-value {
             font-size: 48px;
             font-weight: 600;
             font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', Arial, sans-serif;
             letter-spacing: -1.5px;
             line-height: 1.1;
-        }}
+        }
 
-        .metric-unit {{
+        .metric-unit {
             font-size: 18px;
             color: var(--gray-medium);
             margin-left: 6px;
             font-weight: 400;
-        }}
+        }
 
-        .status-good {{ color: var(--success-green); }}
-        .status-warning {{ color: var(--warning-yellow); }}
-        .status-danger {{ color: var(--danger-red); }}
+        .status-good { color: var(--success-green); }
+        .status-warning { color: var(--warning-yellow); }
+        .status-danger { color: var(--danger-red); }
 
-        .dimension-switch {{
+        .dimension-switch {
             display: inline-flex;
             gap: 0;
             margin-bottom: 20px;
             background: rgba(160, 39, 36, 0.08);
             border-radius: 10px;
             padding: 3px;
-        }}
+        }
 
-        .dimension-btn {{
+        .dimension-btn {
             padding: 10px 24px;
             border: none;
             background: transparent;
@@ -597,29 +1000,29 @@ class HTMLDashboardGenerator:
             font-size: 14px;
             color: var(--gray-dark);
             font-weight: 500;
-        }}
+        }
 
-        .dimension-btn:hover {{
+        .dimension-btn:hover {
             background: rgba(160, 39, 36, 0.12);
-        }}
+        }
 
-        .dimension-btn.active {{
+        .dimension-btn.active {
             background: white;
             color: var(--primary-red);
             box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-        }}
+        }
         
         /* 子标签页样式 */
-        .sub-tabs {{
+        .sub-tabs {
             display: inline-flex;
             gap: 0;
             margin-bottom: 20px;
             background: rgba(160, 39, 36, 0.06);
             border-radius: 9px;
             padding: 3px;
-        }}
+        }
 
-        .sub-tab {{
+        .sub-tab {
             padding: 8px 20px;
             cursor: pointer;
             border-radius: 7px;
@@ -629,19 +1032,19 @@ class HTMLDashboardGenerator:
             border: none;
             transition: var(--transition);
             font-weight: 500;
-        }}
+        }
 
-        .sub-tab:hover {{
+        .sub-tab:hover {
             background: rgba(160, 39, 36, 0.1);
-        }}
+        }
 
-        .sub-tab.active {{
+        .sub-tab.active {
             background: white;
             color: var(--primary-red);
             box-shadow: 0 2px 5px rgba(0,0,0,0.08);
-        }}
+        }
 
-        .chart-container {{
+        .chart-container {
             background: rgba(255, 255, 255, 0.95);
             backdrop-filter: blur(10px);
             -webkit-backdrop-filter: blur(10px);
@@ -651,26 +1054,26 @@ class HTMLDashboardGenerator:
             margin-bottom: 24px;
             border: 1px solid rgba(0,0,0,0.04);
             transition: var(--transition);
-        }}
+        }
 
-        .chart-container:hover {{
+        .chart-container:hover {
             box-shadow: var(--card-shadow-hover);
-        }}
+        }
 
-        .chart {{
+        .chart {
             width: 100%;
             height: 500px;
-        }}
+        }
 
-        .tab-content {{
+        .tab-content {
             display: none;
-        }}
+        }
 
-        .tab-content.active {{
+        .tab-content.active {
             display: block;
-        }}
+        }
 
-        .problem-list {{
+        .problem-list {
             background: linear-gradient(135deg, rgba(255, 192, 0, 0.08) 0%, rgba(255, 192, 0, 0.12) 100%);
             border-left: 3px solid var(--warning-yellow);
             padding: 20px 24px;
@@ -679,9 +1082,9 @@ class HTMLDashboardGenerator:
             box-shadow: 0 2px 8px rgba(255, 192, 0, 0.1);
             backdrop-filter: blur(10px);
             -webkit-backdrop-filter: blur(10px);
-        }}
+        }
 
-        .problem-list h3 {{
+        .problem-list h3 {
             font-size: 15px;
             color: var(--gray-dark);
             margin-bottom: 12px;
@@ -689,19 +1092,19 @@ class HTMLDashboardGenerator:
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
 
-        .problem-list ul {{
+        .problem-list ul {
             list-style: none;
-        }}
+        }
 
-        .problem-list li {{
+        .problem-list li {
             padding: 6px 0;
             color: var(--gray-dark);
             font-size: 14px;
-        }}
+        }
         
-        .error-banner {{
+        .error-banner {
             display: none;
             background-color: #f8d7da;
             color: #721c24;
@@ -709,33 +1112,31 @@ class HTMLDashboardGenerator:
             margin-bottom: 20px;
             border-radius: 4px;
             border: 1px solid #f5c6cb;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .metric-cards {{
+        @media (max-width: 768px) {
+            .metric-cards {
                 grid-template-columns: 1fr;
-            }}
+            }
 
-            .tabs {{
+            .tabs {
                 overflow-x: auto;
-            }}
+            }
 
-            .header, .tabs, .content {{
+            .header, .tabs, .content {
                 padding-left: 20px;
                 padding-right: 20px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>华安保险车险第{self.week}周经营分析</h1>
-        <div class="header-info">
-            {self.organization} | {datetime.now().strftime('%Y年%m月%d日')}
-        </div>
-    </div>
+            }
+        }
+"""
+if RCSSMIN_AVAILABLE:
+    # 导入时压缩一次（去掉缩进、空行与多余空白），之后每次生成直接复用
+    DASHBOARD_CSS = rcssmin.cssmin(DASHBOARD_CSS)
+DASHBOARD_STYLE = '\n    <style>' + DASHBOARD_CSS + '    </style>\n'
 
-    <div class="tabs">
+
+# 标签栏与概览页开头不含变量，位于页头与指标卡片之间
+DASHBOARD_TABS = """    <div class="tabs">
         <div class="tab active" data-tab="overview">经营概览</div>
         <div class="tab" data-tab="premium">保费进度</div>
         <div class="tab" data-tab="cost">变动成本</div>
@@ -749,633 +1150,645 @@ class HTMLDashboardGenerator:
         <!-- 经营概览 -->
         <div id="tab-overview" class="tab-content active">
             <div class="metric-cards">
-                <div class="metric-card">
-                    <div class="metric-label">签单保费</div>
-                    <div class="metric-value">{int(summary['签单保费']/10000)}<span class="metric-unit">万元</span></div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">变动成本率</div>
-                    <div class="metric-value status-{self._get_status(summary['变动成本率'], 'cost')}">{summary['变动成本率']:.1f}<span class="metric-unit">%</span></div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">满期赔付率</div>
-                    <div class="metric-value">{summary['满期赔付率']:.1f}<span class="metric-unit">%</span></div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">费用率</div>
-                    <div class="metric-value">{summary['费用率']:.1f}<span class="metric-unit">%</span></div>
-                </div>
-            </div>
-
-            {self._render_problem_list(problems)}
-
-            <div class="dimension-switch">
-                <button class="dimension-btn active" onclick="switchDimension('overview', 'org')">按机构</button>
-                <button class="dimension-btn" onclick="switchDimension('overview', 'category')">按客户类别</button>
-            </div>
-
-            <div class="chart-container">
-                <div id="chart-overview" class="chart"></div>
-            </div>
-        </div>
-
-        <!-- 其他标签页内容 -->
-        <div id="tab-premium" class="tab-content">
-            <div class="dimension-switch">
-                <button class="dimension-btn active" onclick="switchDimension('premium', 'org')">按机构</button>
-                <button class="dimension-btn" onclick="switchDimension('premium', 'category')">按客户类别</button>
-            </div>
-            <div class="chart-container">
-                <div id="chart-premium" class="chart"></div>
-            </div>
-        </div>
-
-        <div id="tab-cost" class="tab-content">
-            <div class="dimension-switch">
-                <button class="dimension-btn active" onclick="switchDimension('cost', 'org')">按机构</button>
-                <button class="dimension-btn" onclick="switchDimension('cost', 'category')">按客户类别</button>
-            </div>
-            <div class="chart-container">
-                <div id="chart-cost" class="chart"></div>
-            </div>
-        </div>
+"""
 
-        <div id="tab-loss" class="tab-content">
-            <div class="dimension-switch">
-                <button class="dimension-btn active" onclick="switchDimension('loss', 'org')">按机构</button>
-                <button class="dimension-btn" onclick="switchDimension('loss', 'category')">按客户类别</button>
+# 各标签页结构相同：维度切换按钮 + 图表容器（损失暴露页另有子视图按钮），导入时按列表生成一次
+DIMENSION_SWITCH_HTML = """            <div class="dimension-switch">
+                <button class="dimension-btn active" data-tab="{tab}" data-dimension="org">按机构</button>
+                <button class="dimension-btn" data-tab="{tab}" data-dimension="category">按客户类别</button>
             </div>
-            
-            <div class="sub-tabs">
-                <div class="sub-tab active" onclick="switchSubTab('loss', 'bubble')">气泡图分析</div>
-                <div class="sub-tab" onclick="switchSubTab('loss', 'quadrant')">二级指标分析</div>
-            </div>
-            
-            <div class="chart-container">
-                <div id="chart-loss" class="chart"></div>
-            </div>
-        </div>
-
-        <div id="tab-expense" class="tab-content">
-            <div class="dimension-switch">
-                <button class="dimension-btn active" onclick="switchDimension('expense', 'org')">按机构</button>
-                <button class="dimension-btn" onclick="switchDimension('expense', 'category')">按客户类别</button>
+"""
+CHART_CONTAINER_HTML = """            <div class="chart-container">
+                <div id="chart-{tab}" class="chart"></div>
             </div>
-            <div class="chart-container">
-                <div id="chart-expense" class="chart"></div>
+"""
+LOSS_SUB_TABS_HTML = """            <div class="sub-tabs">
+                <div class="sub-tab active" data-tab="loss" data-sub-tab="bubble">气泡图分析</div>
+                <div class="sub-tab" data-tab="loss" data-sub-tab="quadrant">二级指标分析</div>
             </div>
-        </div>
-    </div>
+"""
+# 概览之外的标签页：(标签页, 维度切换与图表之间的附加控件)
+CHART_TABS = (('premium', ''), ('cost', ''), ('loss', LOSS_SUB_TABS_HTML), ('expense', ''))
+
+# 标签页结构与脚本开头同样不含变量，在数据之前原样输出
+DASHBOARD_LAYOUT = (
+    '\n' + DIMENSION_SWITCH_HTML.format(tab='overview') + CHART_CONTAINER_HTML.format(tab='overview')
+    + '        </div>\n\n        <!-- 其他标签页内容 -->\n'
+    + '\n'.join(
+        f'        <div id="tab-{tab}" class="tab-content">\n'
+        + DIMENSION_SWITCH_HTML.format(tab=tab) + controls + CHART_CONTAINER_HTML.format(tab=tab)
+        + '        </div>\n'
+        for tab, controls in CHART_TABS
+    )
+    + """    </div>
 
     <script>
         // 全局错误处理
-        window.onerror = function(message, source, lineno, colno, error) {{
+        window.onerror = function(message, source, lineno, colno, error) {
             const banner = document.getElementById('error-banner');
             banner.style.display = 'block';
-            banner.innerHTML = `<strong>发生错误:</strong> ${{message}}<br><small>${{source}}:${{lineno}}</small>`;
+            // 直接构建节点（不经HTML解析），错误信息按纯文本显示
+            const title = document.createElement('strong');
+            title.textContent = '发生错误:';
+            const location = document.createElement('small');
+            location.textContent = `${source}:${lineno}`;
+            const frag = document.createDocumentFragment();
+            frag.append(title, ` ${message}`, document.createElement('br'), location);
+            banner.replaceChildren(frag);
             console.error('Global error:', error);
             return false;
-        }};
+        };
 
         // 数据
-        const DATA = {data_json};
+        const DATA = """
+)
+
+# 图表脚本（数据之后的部分）同样为静态内容，导入时生成一次，各次生成直接复用
+DASHBOARD_SCRIPT_JS = """
+
+        // 维度数据按列存储（字段名只写一次），首次用到时才还原为记录数组
+        function fromColumnar(table) {
+            const columns = table.columns;
+            return table.rows.map(row => {
+                const record = {};
+                for (let i = 0; i < columns.length; i++) {
+                    record[columns[i]] = row[i];
+                }
+                return record;
+            });
+        }
+        // 首屏只需按机构的数据；按客户类别的数据在第一次切换到该维度时再解码
+        const dimensionTables = { org: DATA.dataByOrg, category: DATA.dataByCategory };
+        const dimensionRecords = {};
+        function getDimensionData(dimension) {
+            if (!dimensionRecords[dimension]) {
+                dimensionRecords[dimension] = fromColumnar(dimensionTables[dimension]);
+            }
+            return dimensionRecords[dimension];
+        }
+
+        // 图表数值保留1位小数：直接数值取整，不经 toFixed/parseFloat 的字符串往返
+        function round1(value) {
+            return Math.round(value * 10) / 10;
+        }
 
         // 当前维度
-        let currentDimensions = {{
+        let currentDimensions = {
             overview: 'org',
             premium: 'org',
             cost: 'org',
             loss: 'org',
             expense: 'org'
-        }};
+        };
         
         // 当前子标签页
-        let currentSubTab = {{
+        let currentSubTab = {
             loss: 'bubble'
-        }};
+        };
+
+        // 已生成的图表配置（键：标签页|维度|子视图）
+        const optionCache = new Map();
 
         // 标签页切换
-        document.querySelectorAll('.tab').forEach(tab => {{
-            tab.addEventListener('click', () => {{
-                try {{
-                    const tabName = tab.dataset.tab;
-
-                    // 更新标签样式
-                    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-                    tab.classList.add('active');
-
-                    // 更新内容显示
-                    document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-                    document.getElementById(`tab-${{tabName}}`).classList.add('active');
-
-                    // 渲染图表
-                    renderChart(tabName);
-                }} catch (e) {{
-                    console.error('Tab switch error:', e);
-                    document.getElementById('error-banner').style.display = 'block';
-                    document.getElementById('error-banner').innerText = '切换标签页时出错: ' + e.message;
-                }}
-            }});
-        }});
+        document.querySelector('.tabs').addEventListener('click', e => {
+            const tab = e.target.closest('.tab');
+            if (!tab) return;
+
+            try {
+                const tabName = tab.dataset.tab;
+
+                // 更新标签样式
+                document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+                tab.classList.add('active');
+
+                // 更新内容显示
+                document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
+                document.getElementById(`tab-${tabName}`).classList.add('active');
+
+                // 渲染图表
+                renderChart(tabName);
+            } catch (e) {
+                console.error('Tab switch error:', e);
+                document.getElementById('error-banner').style.display = 'block';
+                document.getElementById('error-banner').innerText = '切换标签页时出错: ' + e.message;
+            }
+        });
+
+        // 维度/子视图按钮统一由内容区的一个监听器分发（按钮只带 data-* 属性，不再逐个内联 onclick）
+        document.querySelector('.content').addEventListener('click', e => {
+            const dimensionBtn = e.target.closest('[data-dimension]');
+            if (dimensionBtn) {
+                switchDimension(dimensionBtn.dataset.tab, dimensionBtn.dataset.dimension, dimensionBtn);
+                return;
+            }
+            const subTabBtn = e.target.closest('[data-sub-tab]');
+            if (subTabBtn) {
+                switchSubTab(subTabBtn.dataset.tab, subTabBtn.dataset.subTab, subTabBtn);
+            }
+        });
 
         // 维度切换
-        function switchDimension(tab, dimension) {{
-            try {{
+        function switchDimension(tab, dimension, button) {
+            try {
                 currentDimensions[tab] = dimension;
 
                 // 更新按钮样式
-                const container = document.querySelector(`#tab-${{tab}} .dimension-switch`);
+                const container = document.querySelector(`#tab-${tab} .dimension-switch`);
                 container.querySelectorAll('.dimension-btn').forEach(btn => btn.classList.remove('active'));
-                event.target.classList.add('active');
+                button.classList.add('active');
 
                 // 重新渲染图表
                 renderChart(tab);
-            }} catch (e) {{
+            } catch (e) {
                 console.error('Dimension switch error:', e);
                 alert('切换维度出错: ' + e.message);
-            }}
-        }}
+            }
+        }
         
         // 子标签页切换
-        function switchSubTab(tab, subTab) {{
-            try {{
+        function switchSubTab(tab, subTab, button) {
+            try {
                 currentSubTab[tab] = subTab;
                 
                 // 更新按钮样式
-                const container = document.querySelector(`#tab-${{tab}} .sub-tabs`);
+                const container = document.querySelector(`#tab-${tab} .sub-tabs`);
                 container.querySelectorAll('.sub-tab').forEach(btn => btn.classList.remove('active'));
-                event.target.classList.add('active');
+                button.classList.add('active');
                 
                 // 重新渲染图表
                 renderChart(tab);
-            }} catch (e) {{
+            } catch (e) {
                 console.error('Sub-tab switch error:', e);
                 alert('切换视图出错: ' + e.message);
-            }}
-        }}
+            }
+        }
 
         // 渲染图表
-        function renderChart(tab) {{
-            try {{
+        function renderChart(tab) {
+            try {
                 const dimension = currentDimensions[tab];
-                const data = dimension === 'org' ? DATA.dataByOrg : DATA.dataByCategory;
+                const data = getDimensionData(dimension);
                 const dimField = dimension === 'org' ? '机构' : '客户类别';
 
-                const chartDom = document.getElementById(`chart-${{tab}}`);
+                const chartDom = document.getElementById(`chart-${tab}`);
                 if (!chartDom) return;
                 
                 // 确保 echarts 已加载
-                if (typeof echarts === 'undefined') {{
+                if (typeof echarts === 'undefined') {
                     throw new Error('图表库加载失败，请检查网络连接');
-                }}
-                
-                // 销毁旧实例以避免冲突
-                const oldChart = echarts.getInstanceByDom(chartDom);
-                if (oldChart) {{
-                    oldChart.dispose();
-                }}
+                }
                 
-                const chart = echarts.init(chartDom);
+                // 复用已有实例（切换维度/标签页时不再销毁重建画布），首次进入时才初始化
+                let chart = echarts.getInstanceByDom(chartDom);
+                if (chart) {
+                    chart.resize();
+                } else {
+                    chart = echarts.init(chartDom);
+                }
 
-                let option;
+                // 同一视图（标签页+维度+子视图）的配置只生成一次，数据在页面内不变
+                const cacheKey = `${tab}|${dimension}|${currentSubTab[tab] || ''}`;
+                let option = optionCache.get(cacheKey);
 
-                if (tab === 'overview') {{
+                if (option) {
+                    // 返回已访问过的视图，直接复用缓存的配置
+                } else if (tab === 'overview') {
                     // 经营概览 - 检查是否有年计划达成率数据
                     const hasYearPlan = data.some(d => d.年计划达成率 !== null && d.年计划达成率 !== undefined);
 
-                    if (hasYearPlan) {{
+                    if (hasYearPlan) {
                         // 四象限散点图：年计划达成率 vs 变动成本率
-                        option = {{
-                            title: {{
+                        option = {
+                            title: {
                                 text: '年计划达成率 vs 变动成本率',
                                 left: 'center',
-                                textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                            }},
-                            tooltip: {{
+                                textStyle: { fontSize: 18, fontWeight: 'bold' }
+                            },
+                            tooltip: {
                                 trigger: 'item',
-                                formatter: params => {{
+                                formatter: params => {
                                     const d = params.data;
-                                    return `${{d.name}}<br/>
-                                           年计划达成率: ${{d.value[0].toFixed(1)}}%<br/>
-                                           变动成本率: ${{d.value[1].toFixed(1)}}%<br/>
-                                           签单保费: ${{Math.round(d.value[2]/10000)}}万元`;
-                                }}
-                            }},
-                            xAxis: {{
+                                    return `${d.name}<br/>
+                                           年计划达成率: ${d.value[0].toFixed(1)}%<br/>
+                                           变动成本率: ${d.value[1].toFixed(1)}%<br/>
+                                           签单保费: ${Math.round(d.value[2]/10000)}万元`;
+                                }
+                            },
+                            xAxis: {
                                 name: '年计划达成率 (%)',
                                 nameLocation: 'middle',
                                 nameGap: 30,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            yAxis: {{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            yAxis: {
                                 name: '变动成本率 (%)',
                                 nameLocation: 'middle',
                                 nameGap: 40,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            series: [{{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            series: [{
                                 type: 'scatter',
                                 symbolSize: d => Math.sqrt(d[2]) / 100,
-                                data: data.filter(d => d.年计划达成率).map(d => ({{
+                                data: data.filter(d => d.年计划达成率).map(d => ({
                                     name: d[dimField],
                                     value: [d.年计划达成率, d.变动成本率, d.签单保费],
-                                    itemStyle: {{
+                                    itemStyle: {
                                         color: d.变动成本率 > 95 ? '#c00000' : '#00b050'
-                                    }}
-                                }})),
-                                markLine: {{
+                                    }
+                                })),
+                                markLine: {
                                     silent: true,
-                                    lineStyle: {{ type: 'dashed', color: '#999' }},
+                                    lineStyle: { type: 'dashed', color: '#999' },
                                     data: [
-                                        {{ xAxis: 100 }},
-                                        {{ yAxis: 90 }}
+                                        { xAxis: 100 },
+                                        { yAxis: 90 }
                                     ]
-                                }}
-                            }}]
-                        }};
-                    }} else {{
+                                }
+                            }]
+                        };
+                    } else {
                         // 无计划数据 - 使用保费占比 vs 变动成本率
                         const sortedData = [...data].sort((a, b) => a.变动成本率 - b.变动成本率);
-                        option = {{
-                            title: {{
+                        option = {
+                            title: {
                                 text: '变动成本率分布（按' + (dimension === 'org' ? '机构' : '客户类别') + '）',
                                 left: 'center',
-                                textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                            }},
-                            tooltip: {{
+                                textStyle: { fontSize: 18, fontWeight: 'bold' }
+                            },
+                            tooltip: {
                                 trigger: 'axis',
-                                axisPointer: {{ type: 'shadow' }},
-                                formatter: params => {{
+                                axisPointer: { type: 'shadow' },
+                                formatter: params => {
                                     const name = params[0].name;
                                     const idx = sortedData.findIndex(d => d[dimField] === name);
                                     const item = sortedData[idx];
-                                    return `${{name}}<br/>
-                                           变动成本率: ${{item.变动成本率.toFixed(1)}}%<br/>
-                                           签单保费: ${{Math.round(item.签单保费/10000)}}万元<br/>
-                                           保费占比: ${{item.保费占比.toFixed(1)}}%`;
-                                }}
-                            }},
-                            grid: {{
+                                    return `${name}<br/>
+                                           变动成本率: ${item.变动成本率.toFixed(1)}%<br/>
+                                           签单保费: ${Math.round(item.签单保费/10000)}万元<br/>
+                                           保费占比: ${item.保费占比.toFixed(1)}%`;
+                                }
+                            },
+                            grid: {
                                 left: '3%',
                                 right: '4%',
                                 bottom: '15%',
                                 containLabel: true
-                            }},
-                            xAxis: {{
+                            },
+                            xAxis: {
                                 type: 'category',
                                 data: sortedData.map(d => d[dimField]),
-                                axisLabel: {{
+                                axisLabel: {
                                     rotate: 45,
                                     interval: 0
-                                }}
-                            }},
-                            yAxis: {{
+                                }
+                            },
+                            yAxis: {
                                 type: 'value',
                                 name: '变动成本率 (%)',
-                                axisLine: {{ show: true }}
-                            }},
-                            series: [{{
+                                axisLine: { show: true }
+                            },
+                            series: [{
                                 name: '变动成本率',
                                 type: 'bar',
-                                data: sortedData.map(d => ({{
-                                    value: parseFloat(d.变动成本率.toFixed(1)),
-                                    itemStyle: {{
+                                data: sortedData.map(d => ({
+                                    value: round1(d.变动成本率),
+                                    itemStyle: {
                                         color: d.变动成本率 > 95 ? '#c00000' :
                                                d.变动成本率 > 85 ? '#ffc000' : '#00b050'
-                                    }}
-                                }})),
-                                label: {{
+                                    }
+                                })),
+                                label: {
                                     show: true,
                                     position: 'top',
-                                    formatter: params => `${{params.value.toFixed(1)}}%`,
+                                    formatter: params => `${params.value.toFixed(1)}%`,
                                     fontSize: 10
-                                }},
-                                markLine: {{
+                                },
+                                markLine: {
                                     silent: true,
-                                    lineStyle: {{ type: 'dashed', color: '#999', width: 2 }},
-                                    data: [{{ yAxis: 90, label: {{ formatter: '成本率基准: 90%' }} }}]
-                                }}
-                            }}]
-                        }};
-                    }}
-                }} else if (tab === 'cost') {{
+                                    lineStyle: { type: 'dashed', color: '#999', width: 2 },
+                                    data: [{ yAxis: 90, label: { formatter: '成本率基准: 90%' } }]
+                                }
+                            }]
+                        };
+                    }
+                } else if (tab === 'cost') {
                     // 满期赔付率 vs 费用率
-                    option = {{
-                        title: {{
+                    option = {
+                        title: {
                             text: '满期赔付率 vs 费用率',
                             left: 'center',
-                            textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                        }},
-                        tooltip: {{
+                            textStyle: { fontSize: 18, fontWeight: 'bold' }
+                        },
+                        tooltip: {
                             trigger: 'item',
-                            formatter: params => {{
+                            formatter: params => {
                                 const d = params.data;
-                                return `${{d.name}}<br/>
-                                       满期赔付率: ${{d.value[0].toFixed(1)}}%<br/>
-                                       费用率: ${{d.value[1].toFixed(1)}}%<br/>
-                                       签单保费占比: ${{d.value[2].toFixed(1)}}%`;
-                            }}
-                        }},
-                        xAxis: {{
+                                return `${d.name}<br/>
+                                       满期赔付率: ${d.value[0].toFixed(1)}%<br/>
+                                       费用率: ${d.value[1].toFixed(1)}%<br/>
+                                       签单保费占比: ${d.value[2].toFixed(1)}%`;
+                            }
+                        },
+                        xAxis: {
                             name: '满期赔付率 (%)',
                             nameLocation: 'middle',
                             nameGap: 30,
-                            splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                        }},
-                        yAxis: {{
+                            splitLine: { lineStyle: { type: 'dashed' } }
+                        },
+                        yAxis: {
                             name: '费用率 (%)',
                             nameLocation: 'middle',
                             nameGap: 40,
-                            splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                        }},
-                        series: [{{
+                            splitLine: { lineStyle: { type: 'dashed' } }
+                        },
+                        series: [{
                             type: 'scatter',
                             symbolSize: d => d[2] * 5,
-                            data: data.map(d => ({{
+                            data: data.map(d => ({
                                 name: d[dimField],
                                 value: [d.满期赔付率, d.费用率, d.保费占比],
-                                itemStyle: {{
+                                itemStyle: {
                                     color: d.变动成本率 > 95 ? '#c00000' : '#00b050'
-                                }}
-                            }})),
-                            markLine: {{
+                                }
+                            })),
+                            markLine: {
                                 silent: true,
-                                lineStyle: {{ type: 'dashed', color: '#999' }},
+                                lineStyle: { type: 'dashed', color: '#999' },
                                 data: [
-                                    {{ xAxis: 70 }},
-                                    {{ yAxis: 18 }}
+                                    { xAxis: 70 },
+                                    { yAxis: 18 }
                                 ]
-                            }}
-                        }}]
-                    }};
-                }} else if (tab === 'premium') {{
+                            }
+                        }]
+                    };
+                } else if (tab === 'premium') {
                     // 保费进度 - 检查是否有年计划达成率数据
                     const premiumData = data.filter(d => d.年计划达成率 !== null && d.年计划达成率 !== undefined);
 
-                    if (premiumData.length > 0) {{
+                    if (premiumData.length > 0) {
                         // 有计划数据 - 显示年计划达成率柱状图（从低到高排序）
                         premiumData.sort((a, b) => a.年计划达成率 - b.年计划达成率);
-                        option = {{
-                        title: {{
+                        option = {
+                        title: {
                             text: '年计划达成率对比',
                             left: 'center',
-                            textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                        }},
-                        tooltip: {{
+                            textStyle: { fontSize: 18, fontWeight: 'bold' }
+                        },
+                        tooltip: {
                             trigger: 'axis',
-                            axisPointer: {{ type: 'shadow' }},
-                            formatter: params => {{
+                            axisPointer: { type: 'shadow' },
+                            formatter: params => {
                                 const p = params[0];
                                 const index = p.dataIndex;
                                 const item = premiumData[index];
-                                return `${{item[dimField]}}<br/>
-                                   年计划达成率: ${{item.年计划达成率.toFixed(1)}}%<br/>
-                                   签单保费: ${{Math.round(item.签单保费/10000)}}万元`;
-                            }}
-                        }},
-                        grid: {{
+                                return `${item[dimField]}<br/>
+                                   年计划达成率: ${item.年计划达成率.toFixed(1)}%<br/>
+                                   签单保费: ${Math.round(item.签单保费/10000)}万元`;
+                            }
+                        },
+                        grid: {
                             left: '3%',
                             right: '4%',
                             bottom: '15%',
                             containLabel: true
-                        }},
-                        xAxis: {{
+                        },
+                        xAxis: {
                             type: 'category',
                             data: premiumData.map(d => d[dimField]),
-                            axisLabel: {{
+                            axisLabel: {
                                 rotate: 45,
                                 interval: 0
-                            }}
-                        }},
-                        yAxis: {{
+                            }
+                        },
+                        yAxis: {
                             type: 'value',
                             name: '年计划达成率 (%)',
-                            axisLine: {{ show: true }}
-                        }},
-                        series: [{{
+                            axisLine: { show: true }
+                        },
+                        series: [{
                             name: '年计划达成率',
                             type: 'bar',
-                            data: premiumData.map(d => ({{
+                            data: premiumData.map(d => ({
                                 value: d.年计划达成率,
-                                itemStyle: {{
+                                itemStyle: {
                                     color: d.年计划达成率 < 100 ? '#c00000' : '#00b050'
-                                }}
-                            }})),
-                            label: {{
+                                }
+                            })),
+                            label: {
                                 show: true,
                                 position: 'top',
-                                formatter: params => `${{params.value.toFixed(1)}}%`,
+                                formatter: params => `${params.value.toFixed(1)}%`,
                                 fontSize: 10
-                            }},
-                            markLine: {{
+                            },
+                            markLine: {
                                 silent: true,
-                                lineStyle: {{ type: 'dashed', color: '#999', width: 2 }},
-                                data: [{{ yAxis: 100, label: {{ formatter: '达标线: 100%' }} }}]
-                            }}
-                        }}]
-                    }};
-                    }} else {{
+                                lineStyle: { type: 'dashed', color: '#999', width: 2 },
+                                data: [{ yAxis: 100, label: { formatter: '达标线: 100%' } }]
+                            }
+                        }]
+                    };
+                    } else {
                         // 无计划数据 - 显示签单保费分布（从低到高排序）
                         const sortedData = [...data].sort((a, b) => a.签单保费 - b.签单保费);
-                        option = {{
-                            title: {{
+                        option = {
+                            title: {
                                 text: '签单保费分布',
                                 left: 'center',
-                                textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                            }},
-                            tooltip: {{
+                                textStyle: { fontSize: 18, fontWeight: 'bold' }
+                            },
+                            tooltip: {
                                 trigger: 'axis',
-                                axisPointer: {{ type: 'shadow' }},
-                                formatter: params => {{
+                                axisPointer: { type: 'shadow' },
+                                formatter: params => {
                                     const name = params[0].name;
                                     const idx = sortedData.findIndex(d => d[dimField] === name);
                                     const item = sortedData[idx];
-                                    return `${{name}}<br/>
-                                           签单保费: ${{Math.round(item.签单保费/10000)}}万元<br/>
-                                           保费占比: ${{item.保费占比.toFixed(1)}}%<br/>
-                                           变动成本率: ${{item.变动成本率.toFixed(1)}}%`;
-                                }}
-                            }},
-                            grid: {{
+                                    return `${name}<br/>
+                                           签单保费: ${Math.round(item.签单保费/10000)}万元<br/>
+                                           保费占比: ${item.保费占比.toFixed(1)}%<br/>
+                                           变动成本率: ${item.变动成本率.toFixed(1)}%`;
+                                }
+                            },
+                            grid: {
                                 left: '3%',
                                 right: '4%',
                                 bottom: '15%',
                                 containLabel: true
-                            }},
-                            xAxis: {{
+                            },
+                            xAxis: {
                                 type: 'category',
                                 data: sortedData.map(d => d[dimField]),
-                                axisLabel: {{
+                                axisLabel: {
                                     rotate: 45,
                                     interval: 0
-                                }}
-                            }},
-                            yAxis: {{
+                                }
+                            },
+                            yAxis: {
                                 type: 'value',
                                 name: '签单保费 (万元)',
-                                axisLine: {{ show: true }}
-                            }},
-                            series: [{{
+                                axisLine: { show: true }
+                            },
+                            series: [{
                                 name: '签单保费',
                                 type: 'bar',
-                                data: sortedData.map(d => ({{
+                                data: sortedData.map(d => ({
                                     value: Math.round(d.签单保费/10000),
-                                    itemStyle: {{ color: '#a02724' }}
-                                }})),
-                                label: {{
+                                    itemStyle: { color: '#a02724' }
+                                })),
+                                label: {
                                     show: true,
                                     position: 'top',
-                                    formatter: params => `${{params.value}}万`,
+                                    formatter: params => `${params.value}万`,
                                     fontSize: 10
-                                }}
-                            }}]
-                        }};
-                    }}
-                }} else if (tab === 'loss') {{
+                                }
+                            }]
+                        };
+                    }
+                } else if (tab === 'loss') {
                     // 损失暴露 - 气泡图或二级指标分析
                     const subTab = currentSubTab['loss'] || 'bubble';
                     
-                    if (subTab === 'bubble') {{
+                    if (subTab === 'bubble') {
                         // 气泡图: X=满期赔付率, Y=当年已报告赔款占比, Size=签单保费
-                        option = {{
-                            title: {{
+                        option = {
+                            title: {
                                 text: '满期赔付率 vs 已报告赔款占比',
                                 left: 'center',
-                                textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                            }},
-                            tooltip: {{
+                                textStyle: { fontSize: 18, fontWeight: 'bold' }
+                            },
+                            tooltip: {
                                 trigger: 'item',
-                                formatter: params => {{
+                                formatter: params => {
                                     const d = params.data;
-                                    return `${{d.name}}<br/>
-                                           满期赔付率: ${{d.value[0].toFixed(1)}}%<br/>
-                                           已报告赔款占比: ${{d.value[1].toFixed(1)}}%<br/>
-                                           签单保费: ${{Math.round(d.value[2]/10000)}}万元`;
-                                }}
-                            }},
-                            xAxis: {{
+                                    return `${d.name}<br/>
+                                           满期赔付率: ${d.value[0].toFixed(1)}%<br/>
+                                           已报告赔款占比: ${d.value[1].toFixed(1)}%<br/>
+                                           签单保费: ${Math.round(d.value[2]/10000)}万元`;
+                                }
+                            },
+                            xAxis: {
                                 name: '满期赔付率 (%)',
                                 nameLocation: 'middle',
                                 nameGap: 30,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            yAxis: {{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            yAxis: {
                                 name: '已报告赔款占比 (%)',
                                 nameLocation: 'middle',
                                 nameGap: 40,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            series: [{{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            series: [{
                                 type: 'scatter',
                                 symbolSize: d => Math.sqrt(d[2]) / 80,
-                                data: data.map(d => ({{
+                                data: data.map(d => ({
                                     name: d[dimField],
                                     value: [d.满期赔付率, d.已报告赔款占比, d.签单保费],
-                                    itemStyle: {{
+                                    itemStyle: {
                                         color: d.满期赔付率 > 75 ? '#c00000' :
                                                d.满期赔付率 > 60 ? '#ffc000' : '#00b050',
                                         opacity: 0.7
-                                    }}
-                                }})),
-                                markLine: {{
+                                    }
+                                })),
+                                markLine: {
                                     silent: true,
-                                    lineStyle: {{ type: 'dashed', color: '#999' }},
+                                    lineStyle: { type: 'dashed', color: '#999' },
                                     data: [
-                                        {{ xAxis: 70, label: {{ formatter: '赔付率基准: 70%' }} }}
+                                        { xAxis: 70, label: { formatter: '赔付率基准: 70%' } }
                                     ]
-                                }}
-                            }}]
-                        }};
-                    }} else {{
+                                }
+                            }]
+                        };
+                    } else {
                         // 二级指标: X=出险率, Y=案均赔款
-                        option = {{
-                            title: {{
+                        option = {
+                            title: {
                                 text: '出险率 vs 案均赔款',
                                 left: 'center',
-                                textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                            }},
-                            tooltip: {{
+                                textStyle: { fontSize: 18, fontWeight: 'bold' }
+                            },
+                            tooltip: {
                                 trigger: 'item',
-                                formatter: params => {{
+                                formatter: params => {
                                     const d = params.data;
-                                    return `${{d.name}}<br/>
-                                           出险率: ${{d.value[0].toFixed(1)}}%<br/>
-                                           案均赔款: ${{Math.round(d.value[1])}}元<br/>
-                                           签单保费: ${{Math.round(d.value[2]/10000)}}万元`;
-                                }}
-                            }},
-                            xAxis: {{
+                                    return `${d.name}<br/>
+                                           出险率: ${d.value[0].toFixed(1)}%<br/>
+                                           案均赔款: ${Math.round(d.value[1])}元<br/>
+                                           签单保费: ${Math.round(d.value[2]/10000)}万元`;
+                                }
+                            },
+                            xAxis: {
                                 name: '出险率 (%)',
                                 nameLocation: 'middle',
                                 nameGap: 30,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            yAxis: {{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            yAxis: {
                                 name: '案均赔款 (元)',
                                 nameLocation: 'middle',
                                 nameGap: 40,
-                                splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                            }},
-                            series: [{{
+                                splitLine: { lineStyle: { type: 'dashed' } }
+                            },
+                            series: [{
                                 type: 'scatter',
                                 symbolSize: d => Math.sqrt(d[2]) / 80,
-                                data: data.map(d => ({{
+                                data: data.map(d => ({
                                     name: d[dimField],
                                     value: [d.出险率, d.案均赔款, d.签单保费],
-                                    itemStyle: {{
+                                    itemStyle: {
                                         color: '#1890ff',
                                         opacity: 0.7
-                                    }}
-                                }})),
-                                markLine: {{
+                                    }
+                                })),
+                                markLine: {
                                     silent: true,
-                                    lineStyle: {{ type: 'dashed', color: '#999' }},
+                                    lineStyle: { type: 'dashed', color: '#999' },
                                     data: [
-                                        {{ xAxis: 20, label: {{ formatter: '出险率基准: 20%' }} }},
-                                        {{ yAxis: 6000, label: {{ formatter: '案均基准: 6000' }} }}
+                                        { xAxis: 20, label: { formatter: '出险率基准: 20%' } },
+                                        { yAxis: 6000, label: { formatter: '案均基准: 6000' } }
                                     ]
-                                }}
-                            }}]
-                        }};
-                    }}
-                }} else if (tab === 'expense') {{
+                                }
+                            }]
+                        };
+                    }
+                } else if (tab === 'expense') {
                     // 费用支出 - 费用率散点图
-                    option = {{
-                        title: {{
+                    option = {
+                        title: {
                             text: '费用率 vs 费用占比差异',
                             left: 'center',
-                            textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                        }},
-                        tooltip: {{
+                            textStyle: { fontSize: 18, fontWeight: 'bold' }
+                        },
+                        tooltip: {
                             trigger: 'item',
-                            formatter: params => {{
+                            formatter: params => {
                                 const d = params.data;
                                 const expenseShare = d.value[3];
                                 const premiumShare = d.value[4];
                                 const diff = expenseShare - premiumShare;
-                                return `${{d.name}}<br/>
-                                       费用率: ${{d.value[0].toFixed(1)}}%<br/>
-                                       费用占比差异: ${{diff.toFixed(1)}}%<br/>
-                                       保费占比: ${{premiumShare.toFixed(1)}}%<br/>
-                                       签单保费: ${{Math.round(d.value[2]/10000)}}万元`;
-                            }}
-                        }},
-                        xAxis: {{
+                                return `${d.name}<br/>
+                                       费用率: ${d.value[0].toFixed(1)}%<br/>
+                                       费用占比差异: ${diff.toFixed(1)}%<br/>
+                                       保费占比: ${premiumShare.toFixed(1)}%<br/>
+                                       签单保费: ${Math.round(d.value[2]/10000)}万元`;
+                            }
+                        },
+                        xAxis: {
                             name: '费用率 (%)',
                             nameLocation: 'middle',
                             nameGap: 30,
-                            splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                        }},
-                        yAxis: {{
+                            splitLine: { lineStyle: { type: 'dashed' } }
+                        },
+                        yAxis: {
                             name: '费用占比超保费占比 (%)',
                             nameLocation: 'middle',
                             nameGap: 40,
-                            splitLine: {{ lineStyle: {{ type: 'dashed' }} }}
-                        }},
-                        series: [{{
+                            splitLine: { lineStyle: { type: 'dashed' } }
+                        },
+                        series: [{
                             type: 'scatter',
                             symbolSize: d => Math.sqrt(d[2]) / 100,
-                            data: data.map(d => {{
+                            data: data.map(d => {
                                 // 计算费用占比（假设费用 = 签单保费 * 费用率）
                                 const totalPremium = data.reduce((sum, item) => sum + item.签单保费, 0);
                                 const totalExpense = data.reduce((sum, item) => sum + (item.签单保费 * item.费用率 / 100), 0);
@@ -1383,142 +1796,150 @@ class HTMLDashboardGenerator:
                                 const premiumShare = d.保费占比;
                                 const diff = expenseShare - premiumShare;
 
-                                return {{
+                                return {
                                     name: d[dimField],
                                     value: [d.费用率, diff, d.签单保费, expenseShare, premiumShare],
-                                    itemStyle: {{
+                                    itemStyle: {
                                         color: diff > 2 ? '#c00000' :
                                                diff > 0 ? '#ffc000' : '#00b050',
                                         opacity: 0.7
-                                    }}
-                                }};
-                            }}),
-                            markLine: {{
+                                    }
+                                };
+                            }),
+                            markLine: {
                                 silent: true,
-                                lineStyle: {{ type: 'dashed', color: '#999' }},
+                                lineStyle: { type: 'dashed', color: '#999' },
                                 data: [
-                                    {{ xAxis: 18, label: {{ formatter: '费用率基准: 18%' }} }},
-                                    {{ yAxis: 0, label: {{ formatter: '平衡线' }} }}
+                                    { xAxis: 18, label: { formatter: '费用率基准: 18%' } },
+                                    { yAxis: 0, label: { formatter: '平衡线' } }
                                 ]
-                            }}
-                        }}]
-                    }};
-                }} else {{
+                            }
+                        }]
+                    };
+                } else {
                     // 默认柱状图（按签单保费从低到高排序）
                     const sortedData = [...data].sort((a, b) => a.签单保费 - b.签单保费);
-                    option = {{
-                        title: {{
+                    option = {
+                        title: {
                             text: '各项指标对比',
                             left: 'center',
-                            textStyle: {{ fontSize: 18, fontWeight: 'bold' }}
-                        }},
-                        tooltip: {{
+                            textStyle: { fontSize: 18, fontWeight: 'bold' }
+                        },
+                        tooltip: {
                             trigger: 'axis',
-                            axisPointer: {{ type: 'shadow' }},
-                            formatter: params => {{
-                                const name = params[0].name;
-                                let result = `${{name}}<br/>`;
-                                params.forEach(p => {{
+                            axisPointer: { type: 'shadow' },
+                            formatter: params => {
+                                // 每个系列一行，收集后一次拼接
+                                const rows = params.map(p => {
                                     const value = p.seriesName === '签单保费'
                                         ? Math.round(p.value) + '万元'
                                         : p.value.toFixed(1) + '%';
-                                    result += `${{p.marker}}${{p.seriesName}}: ${{value}}<br/>`;
-                                }});
-                                return result;
-                            }}
-                        }},
-                        legend: {{
+                                    return `${p.marker}${p.seriesName}: ${value}<br/>`;
+                                });
+                                return `${params[0].name}<br/>` + rows.join('');
+                            }
+                        },
+                        legend: {
                             data: ['签单保费', '变动成本率'],
                             bottom: 10
-                        }},
-                        xAxis: {{
+                        },
+                        xAxis: {
                             type: 'category',
                             data: sortedData.map(d => d[dimField]),
-                            axisLabel: {{
+                            axisLabel: {
                                 rotate: 45,
                                 interval: 0
-                            }}
-                        }},
+                            }
+                        },
                         yAxis: [
-                            {{ type: 'value', name: '签单保费(万元)' }},
-                            {{ type: 'value', name: '成本率(%)' }}
+                            { type: 'value', name: '签单保费(万元)' },
+                            { type: 'value', name: '成本率(%)' }
                         ],
                         series: [
-                            {{
+                            {
                                 name: '签单保费',
                                 type: 'bar',
                                 data: sortedData.map(d => Math.round(d.签单保费 / 10000)),
-                                itemStyle: {{ color: '#a02724' }}
-                            }},
-                            {{
+                                itemStyle: { color: '#a02724' }
+                            },
+                            {
                                 name: '变动成本率',
                                 type: 'line',
                                 yAxisIndex: 1,
-                                data: sortedData.map(d => parseFloat(d.变动成本率.toFixed(1))),
-                                itemStyle: {{ color: '#00b050' }}
-                            }}
+                                data: sortedData.map(d => round1(d.变动成本率)),
+                                itemStyle: { color: '#00b050' }
+                            }
                         ]
-                    }};
-                }}
+                    };
+                }
+
+                optionCache.set(cacheKey, option);
 
-                chart.setOption(option);
-            }} catch (e) {{
+                // notMerge：整体替换上一次的配置，效果与重新初始化一致
+                chart.setOption(option, true);
+            } catch (e) {
                 console.error('Render chart error:', e);
-                const chartDom = document.getElementById(`chart-${{tab}}`);
-                if (chartDom) {{
-                    chartDom.innerHTML = `<div style="display:flex;justify-content:center;align-items:center;height:100%;color:red;">图表渲染出错: ${{e.message}}</div>`;
-                }}
-            }}
-        }}
+                const chartDom = document.getElementById(`chart-${tab}`);
+                if (chartDom) {
+                    if (typeof echarts !== 'undefined') {
+                        const brokenChart = echarts.getInstanceByDom(chartDom);
+                        if (brokenChart) brokenChart.dispose();
+                    }
+                    const errorBox = document.createElement('div');
+                    errorBox.style.cssText = 'display:flex;justify-content:center;align-items:center;height:100%;color:red;';
+                    errorBox.textContent = `图表渲染出错: ${e.message}`;
+                    chartDom.replaceChildren(errorBox);
+                }
+            }
+        }
 
         // 初始化渲染
         renderChart('overview');
-    </script>
+"""
+DASHBOARD_PAGE_END = """    </script>
 </body>
 </html>"""
+DASHBOARD_SCRIPT = ';' + DASHBOARD_SCRIPT_JS + DASHBOARD_PAGE_END
 
-        return html
-
-    def _get_status(self, value: float, metric_type: str) -> str:
-        """获取指标状态"""
-        if metric_type == 'cost':
-            if value < 85:
-                return 'good'
-            elif value < 95:
-                return 'warning'
-            else:
-                return 'danger'
-        return 'good'
-
-    def _render_problem_list(self, problems: List[str]) -> str:
-        """渲染问题列表"""
-        if not problems:
-            return ""
-
-        items = ''.join([f"<li>• {p}</li>" for p in problems])
-        return f"""
-        <div class="problem-list">
-            <h3>⚠️ 需要关注的问题</h3>
-            <ul>{items}</ul>
-        </div>
-        """
+# 外置脚本模式：图表脚本写到HTML同目录的独立文件，页面只内嵌数据并以 defer 引用脚本，
+# 多份仪表盘共用同一脚本文件，浏览器可缓存
+DASHBOARD_JS_FILENAME = 'dashboard.js'
+DASHBOARD_EXTERNAL_SCRIPT = f""";
+    </script>
+    <script src="{DASHBOARD_JS_FILENAME}" defer></script>
+</body>
+</html>"""
 
 
 def main():
     """主函数"""
-    if len(sys.argv) < 4:
-        print("用法: python generate_html_dashboard.py <数据文件> <周次> <机构名称> [配置目录]")
+    # --no-cache: 忽略已有的聚合结果缓存，重新读取数据
+    # --gzip: 同时输出 .html.gz 压缩文件
+    # --external-js: 图表脚本输出为同目录的 dashboard.js，页面只内嵌数据
+    # --external-data: 图表数据输出为同名的 .data.js，页面引用而不内嵌
+    use_cache = '--no-cache' not in sys.argv
+    compress = '--gzip' in sys.argv
+    external_js = '--external-js' in sys.argv
+    external_data = '--external-data' in sys.argv
+    args = [arg for arg in sys.argv[1:]
+            if arg not in ('--no-cache', '--gzip', '--external-js', '--external-data')]
+
+    if len(args) < 3:
+        print("用法: python generate_html_dashboard.py <数据文件> <周次> <机构名称> [配置目录] "
+              "[--no-cache] [--gzip] [--external-js] [--external-data]")
         print("示例: python generate_html_dashboard.py data.xlsx 49 四川分公司 ../references")
         sys.exit(1)
 
-    data_file = sys.argv[1]
-    week = int(sys.argv[2])
-    organization = sys.argv[3]
-    config_dir = sys.argv[4] if len(sys.argv) > 4 else '../references'
+    data_file = args[0]
+    week = int(args[1])
+    organization = args[2]
+    config_dir = args[3] if len(args) > 3 else '../references'
 
     try:
-        generator = HTMLDashboardGenerator(data_file, week, organization, config_dir)
-        output_path = generator.generate_html()
+        generator = HTMLDashboardGenerator(data_file, week, organization, config_dir,
+                                           use_cache=use_cache)
+        output_path = generator.generate_html(compress=compress, external_js=external_js,
+                                             external_data=external_data)
 
         print(f"\n🎉 生成完成!")
         print(f"📄 输出文件: {os.path.abspath(output_path)}")
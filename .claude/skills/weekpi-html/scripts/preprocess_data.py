@@ -3,11 +3,30 @@
 数据预处理脚本 - 将英文字段名转换为中文字段名
 """
 import pandas as pd
+import numpy as np
 import sys
+from pathlib import Path
+
+# 可选依赖：numexpr（比率计算的除法、乘法与条件判断融合为单次遍历）
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+def safe_ratio(numerator: pd.Series, denominator: pd.Series, scale: float = 1.0) -> np.ndarray:
+    """整列计算 numerator / denominator * scale，分母不大于0（含空值）时为0"""
+    num = numerator.to_numpy(dtype='float64', na_value=np.nan)
+    denom = denominator.to_numpy(dtype='float64', na_value=np.nan)
+    if NUMEXPR_AVAILABLE:
+        return ne.evaluate('where(denom > 0, num / denom * scale, 0.0)')
+    return np.divide(num, denom, out=np.zeros(len(num)), where=denom > 0) * scale
 
 def preprocess_csv_for_dashboard(input_file: str, output_file: str):
     """
     预处理CSV数据，将英文字段名转换为中文字段名，并计算必需的KPI指标
+
+    输出文件扩展名为 .parquet 或 .arrow/.feather 时写出列式文件，其余写CSV
     """
     # 读取原始数据
     df = pd.read_csv(input_file)
@@ -27,20 +46,12 @@ def preprocess_csv_for_dashboard(input_file: str, output_file: str):
     # 重命名列
     df_renamed = df.rename(columns=field_mapping)
 
-    # 计算KPI指标（处理除零错误）
-    df_renamed['满期赔付率'] = df_renamed.apply(
-        lambda x: (x['已报告赔款'] / x['满期保费'] * 100) if x['满期保费'] > 0 else 0, axis=1
-    )
-    df_renamed['费用率'] = df_renamed.apply(
-        lambda x: (x['费用金额'] / x['签单保费'] * 100) if x['签单保费'] > 0 else 0, axis=1
-    )
+    # 计算KPI指标（处理除零错误，整列向量化计算）
+    df_renamed['满期赔付率'] = safe_ratio(df_renamed['已报告赔款'], df_renamed['满期保费'], 100)
+    df_renamed['费用率'] = safe_ratio(df_renamed['费用金额'], df_renamed['签单保费'], 100)
     df_renamed['变动成本率'] = df_renamed['满期赔付率'] + df_renamed['费用率']
-    df_renamed['出险率'] = df_renamed.apply(
-        lambda x: (x['出险件数'] / x['保单数'] * 100) if x['保单数'] > 0 else 0, axis=1
-    )
-    df_renamed['案均赔款'] = df_renamed.apply(
-        lambda x: (x['已报告赔款'] / x['出险件数']) if x['出险件数'] > 0 else 0, axis=1
-    )
+    df_renamed['出险率'] = safe_ratio(df_renamed['出险件数'], df_renamed['保单数'], 100)
+    df_renamed['案均赔款'] = safe_ratio(df_renamed['已报告赔款'], df_renamed['出险件数'])
 
     # 选择必需的列
     required_columns = [
@@ -50,8 +61,14 @@ def preprocess_csv_for_dashboard(input_file: str, output_file: str):
 
     df_output = df_renamed[required_columns]
 
-    # 保存处理后的数据
-    df_output.to_csv(output_file, index=False, encoding='utf-8')
+    # 保存处理后的数据（按扩展名选择格式，列式格式可免去下游的CSV解析）
+    output_ext = Path(output_file).suffix.lower()
+    if output_ext == '.parquet':
+        df_output.to_parquet(output_file, index=False)
+    elif output_ext in ('.arrow', '.feather'):
+        df_output.reset_index(drop=True).to_feather(output_file)
+    else:
+        df_output.to_csv(output_file, index=False, encoding='utf-8')
 
     print(f"✅ 数据预处理完成")
     print(f"📊 输入文件: {input_file}")
@@ -63,7 +80,7 @@ def preprocess_csv_for_dashboard(input_file: str, output_file: str):
 
 if __name__ == '__main__':
     if len(sys.argv) < 3:
-        print("用法: python preprocess_data.py <输入文件> <输出文件>")
+        print("用法: python preprocess_data.py <输入文件> <输出文件(.csv/.parquet/.arrow)>")
         sys.exit(1)
 
     input_file = sys.argv[1]
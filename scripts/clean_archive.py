@@ -11,12 +11,48 @@
 
 import os
 import re
+import time
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Tuple
 import argparse
 
 
+SECONDS_PER_DAY = 86400
+AGE_THRESHOLDS_DAYS = (180, 365)  # 较新 | 较旧 | 非常旧
+SIZE_THRESHOLDS_KB = (10, 100)    # 小型 | 中型 | 大型
+
+
+def parse_selection(text: str, count: int) -> List[int]:
+    """
+    解析序号选择，如 "1-5,8" -> [0, 1, 2, 3, 4, 7]（返回从0开始的索引）
+
+    Raises:
+        ValueError: 格式错误或序号超出范围
+    """
+    selected: Set[int] = set()
+
+    for part in text.replace('，', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(x) for x in part.split('-', 1))
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"无法识别的序号: {part}")
+        if start > end:
+            start, end = end, start
+        if start < 1 or end > count:
+            raise ValueError(f"序号超出范围 (1-{count}): {part}")
+        selected.update(range(start - 1, end))
+
+    return sorted(selected)
+
+
 class ArchiveAnalyzer:
     """归档文档分析器"""
 
@@ -35,6 +71,9 @@ class ArchiveAnalyzer:
 
         print(f"📁 扫描归档目录: {self.archive_dir}\n")
 
+        # 当前时间只取一次，所有文件共用
+        now_ts = time.time()
+
         for file_path in self.archive_dir.glob('*.md'):
             stat = file_path.stat()
 
@@ -45,7 +84,7 @@ class ArchiveAnalyzer:
                 'size_kb': stat.st_size / 1024,
                 'created': datetime.fromtimestamp(stat.st_ctime),
                 'modified': datetime.fromtimestamp(stat.st_mtime),
-                'age_days': (datetime.now() - datetime.fromtimestamp(stat.st_mtime)).days
+                'age_days': int((now_ts - stat.st_mtime) // SECONDS_PER_DAY)
             }
 
             self.archived_files.append(file_info)
@@ -100,8 +139,6 @@ class ArchiveAnalyzer:
 
     def generate_report(self) -> Dict:
         """生成分析报告"""
-        now = datetime.now()
-
         # 按年龄分类
         very_old = []  # > 365天
         old = []       # 180-365天
@@ -116,14 +153,13 @@ class ArchiveAnalyzer:
         medium = []    # 10-100KB
         small = []     # < 10KB
 
+        age_buckets = (recent, old, very_old)
+        size_buckets = (small, medium, large)
+
         for file_info in self.archived_files:
-            # 按年龄
-            if file_info['age_days'] > 365:
-                very_old.append(file_info)
-            elif file_info['age_days'] > 180:
-                old.append(file_info)
-            else:
-                recent.append(file_info)
+            # 按年龄 / 按大小：阈值在边界上归入较小一档，与 "> 阈值" 语义一致
+            age_buckets[bisect_left(AGE_THRESHOLDS_DAYS, file_info['age_days'])].append(file_info)
+            size_buckets[bisect_left(SIZE_THRESHOLDS_KB, file_info['size_kb'])].append(file_info)
 
             # 按引用
             if self.references[file_info['name']]:
@@ -131,14 +167,6 @@ class ArchiveAnalyzer:
             else:
                 unreferenced.append(file_info)
 
-            # 按大小
-            if file_info['size_kb'] > 100:
-                large.append(file_info)
-            elif file_info['size_kb'] > 10:
-                medium.append(file_info)
-            else:
-                small.append(file_info)
-
         return {
             'total': len(self.archived_files),
             'very_old': very_old,
@@ -189,9 +217,10 @@ class ArchiveAnalyzer:
         print()
 
         # 建议删除：超过1年且未被引用的文档
+        unreferenced_names = {u['name'] for u in report['unreferenced']}
         candidates_for_deletion = [
             f for f in report['very_old']
-            if f['name'] in [u['name'] for u in report['unreferenced']]
+            if f['name'] in unreferenced_names
         ]
 
         if candidates_for_deletion:
@@ -236,9 +265,10 @@ class ArchiveAnalyzer:
 
     def interactive_cleanup(self, report: Dict):
         """交互式清理"""
+        unreferenced_names = {u['name'] for u in report['unreferenced']}
         candidates_for_deletion = [
             f for f in report['very_old']
-            if f['name'] in [u['name'] for u in report['unreferenced']]
+            if f['name'] in unreferenced_names
         ]
 
         if not candidates_for_deletion:
@@ -250,42 +280,54 @@ class ArchiveAnalyzer:
         print("=" * 70)
         print()
 
-        deleted_count = 0
+        # 一次性列出全部候选文件，用户只需输入一次选择
+        print(f"{'序号':>4}  {'最后修改':<10}  {'天数':>6}  {'大小(KB)':>9}  文件名")
+        for idx, file_info in enumerate(candidates_for_deletion, 1):
+            print(f"{idx:>4}  {file_info['modified'].strftime('%Y-%m-%d'):<10}  "
+                  f"{file_info['age_days']:>6}  {file_info['size_kb']:>9.1f}  {file_info['name']}")
+        print()
 
-        for file_info in candidates_for_deletion:
-            print(f"文件: {file_info['name']}")
-            print(f"  最后修改: {file_info['modified'].strftime('%Y-%m-%d')} ({file_info['age_days']}天前)")
-            print(f"  大小: {file_info['size_kb']:.1f} KB")
-
-            while True:
-                response = input("\n  删除此文件? (y/n/q=退出): ").lower().strip()
-
-                if response == 'q':
-                    print(f"\n✅ 已删除 {deleted_count} 个文件")
-                    return
-                elif response == 'y':
-                    try:
-                        file_info['path'].unlink()
-                        print(f"  ✓ 已删除: {file_info['name']}")
-                        deleted_count += 1
-                    except Exception as e:
-                        print(f"  ❌ 删除失败: {e}")
-                    break
-                elif response == 'n':
-                    print(f"  ⊘ 保留: {file_info['name']}")
+        while True:
+            response = input("选择要删除的序号 (如 1-5,8；a=全部；回车或q=退出): ").lower().strip()
+
+            if response in ('', 'q'):
+                print("\n✅ 未删除任何文件")
+                return
+            if response == 'a':
+                selected = list(range(len(candidates_for_deletion)))
+                confirm = input(f"确认删除全部 {len(selected)} 个文件? (y/N): ").lower().strip()
+                if confirm == 'y':
                     break
-                else:
-                    print("  请输入 y, n, 或 q")
+                print("\n✅ 未删除任何文件")
+                return
+            try:
+                selected = parse_selection(response, len(candidates_for_deletion))
+                break
+            except ValueError as e:
+                print(f"  {e}")
 
-            print()
+        deleted_count = 0
+        failed = []
+
+        for idx in selected:
+            file_info = candidates_for_deletion[idx]
+            try:
+                file_info['path'].unlink()
+                deleted_count += 1
+            except OSError as e:
+                failed.append((file_info['name'], e))
+
+        for name, e in failed:
+            print(f"  ❌ 删除失败: {name}: {e}")
 
-        print(f"✅ 清理完成！共删除 {deleted_count} 个文件")
+        print(f"\n✅ 清理完成！共删除 {deleted_count} 个文件")
 
     def auto_cleanup(self, report: Dict, dry_run: bool = True):
         """自动清理"""
+        unreferenced_names = {u['name'] for u in report['unreferenced']}
         candidates_for_deletion = [
             f for f in report['very_old']
-            if f['name'] in [u['name'] for u in report['unreferenced']]
+            if f['name'] in unreferenced_names
         ]
 
         if not candidates_for_deletion:
@@ -301,9 +343,11 @@ class ArchiveAnalyzer:
             print("⚠️  DRY RUN 模式 - 不会实际删除文件\n")
 
         deleted_count = 0
+        # 行首标记在循环外确定一次
+        action_prefix = '[DRY RUN] 删除' if dry_run else '删除'
 
         for file_info in candidates_for_deletion:
-            print(f"{'[DRY RUN] ' if dry_run else ''}删除: {file_info['name']}")
+            print(f"{action_prefix}: {file_info['name']}")
             print(f"  最后修改: {file_info['modified'].strftime('%Y-%m-%d')} ({file_info['age_days']}天前)")
 
             if not dry_run:
@@ -7,8 +7,29 @@
 import os
 import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+
+# 读取文档的并行线程数：扫描以文件读取等待为主，线程数可高于CPU核数
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 文档解析用到的正则，导入时编译一次，各文档复用
+HASHTAG_PATTERN = re.compile(r'#(\w+[\u4e00-\u9fa5\w]*)')
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+ADR_NUMBER_PATTERN = re.compile(r'ADR-(\d+)')
+# frontmatter 结束行：去掉首尾空白后为 "---" 的行
+FRONTMATTER_END_PATTERN = re.compile(r'^\s*---\s*$', re.M)
+
+def is_markdown_name(name: str) -> bool:
+    """是否为 Markdown 文件名（与 glob('*.md') 一致，不含隐藏文件）"""
+    return name.endswith('.md') and not name.startswith('.')
+
+def list_markdown_files(directory: Path) -> List[Path]:
+    """按文件名排序列出目录下的 Markdown 文件（os.scandir 一次读取目录项，文件类型来自目录项本身）"""
+    with os.scandir(directory) as entries:
+        return sorted(Path(entry.path) for entry in entries
+                      if is_markdown_name(entry.name) and entry.is_file())
 
 class DocsIndexer:
     """文档索引器 - 适配车险项目文档结构"""
@@ -34,8 +55,19 @@ class DocsIndexer:
         self.tags_index: Dict[str, List[Dict]] = {}
         # 新增：文档依赖关系 {文档: [它引用的文档列表]}
         self.dependencies: Dict[str, List[str]] = {}
+        # 本次运行的基准时间：“最近更新”判断与索引中的时间均以此为准，不再逐文档取当前时间
+        self.now = datetime.now()
+        self.recent_cutoff = self.now - timedelta(days=30)
 
-    def extract_frontmatter(self, file_path: Path) -> Dict[str, Any]:
+    def read_document(self, file_path: Path) -> str:
+        """读取文档全文（每个文档只打开一次，各提取方法共用同一份内容）；读取失败时返回空字符串"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except Exception:
+            return ''
+
+    def extract_frontmatter(self, content: str) -> Dict[str, Any]:
         """提取 YAML Frontmatter 元数据"""
         metadata = {
             'id': '',
@@ -49,100 +81,76 @@ class DocsIndexer:
             'complexity': ''
         }
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-                if not lines or lines[0].strip() != '---':
-                    return metadata
-                
-                for line in lines[1:]:
-                    if line.strip() == '---':
-                        break
-                    
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        if key == 'tags':
-                            # 处理 [tag1, tag2]
-                            value = value.strip('[]')
-                            tags = [t.strip().strip('"\'') for t in value.split(',') if t.strip()]
-                            metadata['tags'] = tags
-                        else:
-                            metadata[key] = value
-                            
-        except Exception as e:
-            pass
-            
+        # 只切出 frontmatter 区块再逐行解析，不为整篇文档构建行列表
+        first_end = content.find('\n')
+        first_line = content if first_end < 0 else content[:first_end]
+        if first_line.strip() != '---' or first_end < 0:
+            return metadata
+
+        closing = FRONTMATTER_END_PATTERN.search(content, first_end + 1)
+        block = content[first_end + 1:closing.start() if closing else len(content)]
+
+        for line in block.split('\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                key = key.strip()
+                value = value.strip()
+
+                if key == 'tags':
+                    # 处理 [tag1, tag2]
+                    value = value.strip('[]')
+                    tags = [t.strip().strip('"\'') for t in value.split(',') if t.strip()]
+                    metadata['tags'] = tags
+                else:
+                    metadata[key] = value
+
         return metadata
 
-    def extract_title(self, file_path: Path, metadata: Dict = {}) -> str:
-        """从Markdown文件提取标题，优先使用 metadata"""
-        if metadata and metadata.get('title'):
-            return metadata['title']
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('# '):
-                        return line[2:].strip()
-                    elif line.startswith('## '):
-                        return line[3:].strip()
-            return file_path.stem
-        except:
-            return file_path.stem
-
-    def extract_summary(self, file_path: Path, max_lines: int = 5) -> str:
-        """提取文件的简短摘要"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = []
-                in_frontmatter = False
-                skip_count = 0
-
-                for line in f:
-                    line = line.strip()
-
-                    # 跳过YAML frontmatter
-                    if line == '---':
-                        if not in_frontmatter:
-                            in_frontmatter = True
-                            continue
-                        else:
-                            in_frontmatter = False
-                            continue
-
-                    if in_frontmatter:
-                        continue
-
-                    # 跳过标题行
-                    if line.startswith('#'):
-                        skip_count += 1
-                        if skip_count > 1:
-                            continue
-                        continue
-
-                    # 跳过空行
-                    if not line:
-                        continue
-
-                    # 跳过分隔线
-                    if line.startswith('---') or line.startswith('==='):
-                        continue
-
-                    # 收集有效内容
-                    if len(lines) < max_lines:
-                        lines.append(line)
-                    else:
-                        break
-
-                return ' '.join(lines)[:200] + '...' if lines else ''
-        except:
-            return ''
+    def extract_title_and_summary(self, content: str, file_path: Path, metadata: Dict = {},
+                                  max_lines: int = 5) -> Tuple[str, str]:
+        """一次遍历同时提取标题与简短摘要
+
+        标题优先使用 metadata，其次为第一个 "# " / "## " 标题行，都没有时使用文件名；
+        摘要跳过 frontmatter、标题行、空行和分隔线，取前 max_lines 行有效内容。
+        """
+        title = metadata.get('title') if metadata else ''
+        lines = []
+        in_frontmatter = False
+
+        for line in content.splitlines():
+            line = line.strip()
+
+            if not title:
+                if line.startswith('# '):
+                    title = line[2:].strip()
+                elif line.startswith('## '):
+                    title = line[3:].strip()
+
+            if len(lines) >= max_lines:
+                # 摘要已收集完，只需继续寻找标题
+                if title:
+                    break
+                continue
+
+            # 跳过YAML frontmatter
+            if line == '---':
+                in_frontmatter = not in_frontmatter
+                continue
+
+            if in_frontmatter:
+                continue
+
+            # 跳过标题行、空行和分隔线
+            if line.startswith('#') or not line:
+                continue
+            if line.startswith('---') or line.startswith('==='):
+                continue
+
+            # 收集有效内容
+            lines.append(line)
+
+        summary = ' '.join(lines)[:200] + '...' if lines else ''
+        return title or file_path.stem, summary
 
     def get_file_stats(self, file_path: Path, metadata: Dict = {}) -> Dict:
         """获取文件统计信息，优先使用 metadata 中的 updated_at"""
@@ -163,8 +171,8 @@ class DocsIndexer:
                 
         return stats
 
-    def extract_tags(self, file_path: Path, metadata: Dict = {}) -> List[str]:
-        """从文件中提取标签（frontmatter 和 hashtags）"""
+    def extract_tags(self, content: str, metadata: Dict = {}) -> List[str]:
+        """从文档内容中提取标签（frontmatter 和 hashtags）"""
         tags = set()
         
         # 1. 从 metadata 中获取
@@ -172,46 +180,26 @@ class DocsIndexer:
             for tag in metadata['tags']:
                 tags.add(tag)
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # 2. 提取文档中的 hashtags (#标签)
-                hashtag_pattern = re.compile(r'#(\w+[\u4e00-\u9fa5\w]*)')
-                for match in hashtag_pattern.finditer(content):
-                    tag = match.group(1)
-                    # 排除一些常见的非标签用法（如标题）
-                    if not tag.isdigit():  # 不是纯数字
-                        tags.add(tag)
-
-        except Exception as e:
-            pass
+        # 2. 提取文档中的 hashtags (#标签)，排除纯数字等非标签用法
+        tags.update(tag for tag in HASHTAG_PATTERN.findall(content) if not tag.isdigit())
 
         return sorted(list(tags))
 
-    def extract_links(self, file_path: Path) -> List[str]:
-        """提取文档中的所有链接"""
+    def extract_links(self, content: str) -> List[str]:
+        """提取文档内容中的所有链接"""
         links = []
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # 提取 Markdown 链接 [text](path)
-                link_pattern = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-                for match in link_pattern.finditer(content):
-                    link_path = match.group(2)
-
-                    # 只保留相对路径链接（文档内链接）
-                    if not link_path.startswith('http') and link_path.endswith('.md'):
-                        # 规范化路径
-                        if link_path.startswith('./') or link_path.startswith('../'):
-                            links.append(link_path)
-                        else:
-                            links.append(link_path)
+        # 提取 Markdown 链接 [text](path)
+        for match in MARKDOWN_LINK_PATTERN.finditer(content):
+            link_path = match.group(2)
 
-        except Exception as e:
-            pass
+            # 只保留相对路径链接（文档内链接）
+            if not link_path.startswith('http') and link_path.endswith('.md'):
+                # 规范化路径
+                if link_path.startswith('./') or link_path.startswith('../'):
+                    links.append(link_path)
+                else:
+                    links.append(link_path)
 
         return links
         
@@ -236,8 +224,34 @@ class DocsIndexer:
                 code_files = [metadata['related_code']]
         return code_files
 
-    def process_file(self, file_path: Path, category: str, category_list: List):
-        """通用文件处理逻辑"""
+    def analyze_file(self, file_path: Path) -> Dict[str, Any]:
+        """读取并解析单个文档（不修改索引状态，可在线程池中并行执行）"""
+        # 文档只读取一次，各项提取共用同一份内容
+        content = self.read_document(file_path)
+        metadata = self.extract_frontmatter(content)
+        title, summary = self.extract_title_and_summary(content, file_path, metadata)
+        return {
+            'metadata': metadata,
+            'title': title,
+            'summary': summary,
+            'stats': self.get_file_stats(file_path, metadata),
+            'tags': self.extract_tags(content, metadata),
+            'links': self.extract_links(content),
+            'related_code': self.extract_related_code(file_path, metadata)
+        }
+
+    def process_files(self, file_paths: List[Path], category: str, category_list: List):
+        """并行读取解析一批文档，再在主线程按原顺序写入索引（索引状态只由单线程修改，无需加锁）"""
+        if not file_paths:
+            return
+        with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(file_paths))) as executor:
+            analyses = list(executor.map(self.analyze_file, file_paths))
+        for file_path, analysis in zip(file_paths, analyses):
+            self.process_file(file_path, category, category_list, analysis)
+
+    def process_file(self, file_path: Path, category: str, category_list: List,
+                     analysis: Dict[str, Any] = None):
+        """通用文件处理逻辑（analysis 为 analyze_file 的结果，未提供时当场解析）"""
         # 映射 category 到 stats key
         stats_key_map = {
             'feature': 'features',
@@ -251,13 +265,15 @@ class DocsIndexer:
 
         self.stats['total_files'] += 1
 
-        metadata = self.extract_frontmatter(file_path)
-        title = self.extract_title(file_path, metadata)
-        summary = self.extract_summary(file_path)
-        stats = self.get_file_stats(file_path, metadata)
-        tags = self.extract_tags(file_path, metadata)
-        links = self.extract_links(file_path)
-        related_code = self.extract_related_code(file_path, metadata)
+        if analysis is None:
+            analysis = self.analyze_file(file_path)
+        metadata = analysis['metadata']
+        title = analysis['title']
+        summary = analysis['summary']
+        stats = analysis['stats']
+        tags = analysis['tags']
+        links = analysis['links']
+        related_code = analysis['related_code']
 
         relative_path = str(file_path.relative_to(self.docs_dir))
         
@@ -298,7 +314,7 @@ class DocsIndexer:
             self.dependencies[relative_path] = links
 
         # 检查是否是最近更新的
-        if (datetime.now() - stats['modified']).days < 30:
+        if stats['modified'] > self.recent_cutoff:
             self.index['recent_updates'].append({
                 'type': category,
                 'title': title,
@@ -313,13 +329,16 @@ class DocsIndexer:
         if not features_dir.exists():
             return
 
-        for feature_dir in sorted(features_dir.iterdir()):
-            if not feature_dir.is_dir():
-                continue
+        # os.scandir 的目录项自带文件类型，判断是否为目录无需再逐项 stat
+        with os.scandir(features_dir) as entries:
+            feature_dirs = sorted(entry.name for entry in entries if entry.is_dir())
 
-            readme = feature_dir / 'README.md'
+        readmes = []
+        for name in feature_dirs:
+            readme = features_dir / name / 'README.md'
             if readme.exists():
-                self.process_file(readme, 'feature', self.index['features'])
+                readmes.append(readme)
+        self.process_files(readmes, 'feature', self.index['features'])
 
     def scan_decisions(self):
         """扫描02_decisions目录"""
@@ -327,8 +346,7 @@ class DocsIndexer:
         if not decisions_dir.exists():
             return
 
-        for md_file in sorted(decisions_dir.glob('*.md')):
-            self.process_file(md_file, 'decision', self.index['decisions'])
+        self.process_files(list_markdown_files(decisions_dir), 'decision', self.index['decisions'])
 
     def scan_technical(self):
         """扫描03_technical_design目录"""
@@ -336,8 +354,7 @@ class DocsIndexer:
         if not tech_dir.exists():
             return
 
-        for md_file in sorted(tech_dir.glob('*.md')):
-            self.process_file(md_file, 'technical', self.index['technical'])
+        self.process_files(list_markdown_files(tech_dir), 'technical', self.index['technical'])
 
     def scan_refactoring(self):
         """扫描04_refactoring目录"""
@@ -345,20 +362,21 @@ class DocsIndexer:
         if not refactor_dir.exists():
             return
 
-        for md_file in sorted(refactor_dir.glob('*.md')):
-            self.process_file(md_file, 'refactoring', self.index['refactoring'])
+        self.process_files(list_markdown_files(refactor_dir), 'refactoring', self.index['refactoring'])
 
     def count_archived(self):
         """统计归档文档数量"""
         archive_dir = self.docs_dir / 'archive'
         if archive_dir.exists():
-            self.stats['archived_docs'] = len(list(archive_dir.glob('*.md')))
+            with os.scandir(archive_dir) as entries:
+                self.stats['archived_docs'] = sum(1 for entry in entries if is_markdown_name(entry.name))
 
     def generate_index_content(self) -> str:
         """生成索引内容"""
-        content = f'''# 车险数据分析平台 - 知识库索引
+        # 各段依次追加到列表，最后一次拼接
+        parts = [f'''# 车险数据分析平台 - 知识库索引
 
-> 📅 最后更新: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+> 📅 最后更新: {self.now.strftime("%Y-%m-%d %H:%M:%S")}
 > 🔄 自动生成 by `scripts/generate_docs_index.py`
 
 ---
@@ -378,13 +396,13 @@ class DocsIndexer:
 
 ## 🔥 最近更新（30天内）
 
-'''
+''']
         # 按修改时间排序最近更新
         recent = sorted(self.index['recent_updates'], key=lambda x: x['modified'], reverse=True)
 
         if recent:
             for item in recent[:10]:  # 显示最近10个
-                days_ago = (datetime.now() - item['modified']).days
+                days_ago = (self.now - item['modified']).days
                 time_str = f"{days_ago}天前" if days_ago > 0 else "今天"
                 emoji_map = {
                     'feature': '🎯',
@@ -395,15 +413,15 @@ class DocsIndexer:
                 emoji = emoji_map.get(item['type'], '📄')
                 status_emoji = self.get_status_emoji(item.get('status'))
                 
-                content += f"- {emoji} {status_emoji} [{item['title']}]({item['path']}) - *{time_str}*\n"
+                parts.append(f"- {emoji} {status_emoji} [{item['title']}]({item['path']}) - *{time_str}*\n")
         else:
-            content += "*暂无最近更新*\n"
+            parts.append("*暂无最近更新*\n")
 
-        content += "\n---\n\n"
+        parts.append("\n---\n\n")
 
         # 功能模块索引
-        content += "## 🎯 功能模块文档\n\n"
-        content += "> 按功能ID排序，包含开发状态和优先级\n\n"
+        parts.append("## 🎯 功能模块文档\n\n")
+        parts.append("> 按功能ID排序，包含开发状态和优先级\n\n")
 
         if self.index['features']:
             for feature in self.index['features']:
@@ -411,73 +429,73 @@ class DocsIndexer:
                 priority = "P0" if "F001" in feature['id'] or "F002" in feature['id'] or "F003" in feature['id'] or "F004" in feature['id'] else "P1/P2"
                 status_emoji = self.get_status_emoji(feature.get('status'))
                 
-                content += f"### {status_emoji} [{feature['id']}] {feature['title']}\n\n"
-                content += f"- **优先级**: {priority}\n"
+                parts.append(f"### {status_emoji} [{feature['id']}] {feature['title']}\n\n")
+                parts.append(f"- **优先级**: {priority}\n")
                 if feature.get('status'):
-                    content += f"- **状态**: {feature['status']}\n"
-                content += f"- **路径**: [`{feature['path']}`]({feature['path']})\n"
+                    parts.append(f"- **状态**: {feature['status']}\n")
+                parts.append(f"- **路径**: [`{feature['path']}`]({feature['path']})\n")
                 if feature['summary']:
-                    content += f"- **说明**: {feature['summary']}\n"
-                content += f"- **最后更新**: {feature['modified'].strftime('%Y-%m-%d')}\n\n"
+                    parts.append(f"- **说明**: {feature['summary']}\n")
+                parts.append(f"- **最后更新**: {feature['modified'].strftime('%Y-%m-%d')}\n\n")
         else:
-            content += "*暂无功能文档*\n\n"
+            parts.append("*暂无功能文档*\n\n")
 
-        content += "---\n\n"
+        parts.append("---\n\n")
 
         # 技术决策索引
-        content += "## 🏗️ 技术决策记录（ADR）\n\n"
-        content += "> Architecture Decision Records - 记录关键技术选型和设计决策\n\n"
+        parts.append("## 🏗️ 技术决策记录（ADR）\n\n")
+        parts.append("> Architecture Decision Records - 记录关键技术选型和设计决策\n\n")
 
         if self.index['decisions']:
-            content += "| 状态 | ADR编号 | 决策标题 | 摘要 | 文档 |\n"
-            content += "|------|---------|---------|------|------|\n"
+            parts.append("| 状态 | ADR编号 | 决策标题 | 摘要 | 文档 |\n")
+            parts.append("|------|---------|---------|------|------|\n")
             for decision in self.index['decisions']:
                 # 提取ADR编号
-                match = re.search(r'ADR-(\d+)', decision['file'])
+                match = ADR_NUMBER_PATTERN.search(decision['file'])
                 adr_num = match.group(1) if match else "N/A"
                 summary_short = decision['summary'][:60] + '...' if len(decision['summary']) > 60 else decision['summary']
                 status_emoji = self.get_status_emoji(decision.get('status'))
                 
-                content += f"| {status_emoji} | ADR-{adr_num} | {decision['title']} | {summary_short} | [`{decision['file']}`]({decision['path']}) |\n"
+                parts.append(f"| {status_emoji} | ADR-{adr_num} | {decision['title']} | {summary_short} | [`{decision['file']}`]({decision['path']}) |\n")
         else:
-            content += "*暂无技术决策文档*\n\n"
+            parts.append("*暂无技术决策文档*\n\n")
 
-        content += "\n---\n\n"
+        parts.append("\n---\n\n")
 
         # 技术设计文档
-        content += "## ⚙️ 技术设计文档\n\n"
-        content += "> 核心技术架构、数据模型、计算公式等\n\n"
+        parts.append("## ⚙️ 技术设计文档\n\n")
+        parts.append("> 核心技术架构、数据模型、计算公式等\n\n")
 
         if self.index['technical']:
-            content += "| 状态 | 域 | 标题 | 内容 | 路径 |\n"
-            content += "|------|----|------|------|------|\n"
+            parts.append("| 状态 | 域 | 标题 | 内容 | 路径 |\n")
+            parts.append("|------|----|------|------|------|\n")
             for tech in self.index['technical']:
                 status_emoji = self.get_status_emoji(tech.get('status'))
                 domain = tech.get('domain', '-') or '-'
                 summary_short = tech['summary'][:50] + '...' if len(tech['summary']) > 50 else tech['summary']
                 
-                content += f"| {status_emoji} | {domain} | {tech['title']} | {summary_short} | [`{tech['path']}`]({tech['path']}) |\n"
+                parts.append(f"| {status_emoji} | {domain} | {tech['title']} | {summary_short} | [`{tech['path']}`]({tech['path']}) |\n")
         else:
-            content += "*暂无技术设计文档*\n\n"
+            parts.append("*暂无技术设计文档*\n\n")
 
-        content += "\n---\n\n"
+        parts.append("\n---\n\n")
 
         # 重构文档
-        content += "## 🔧 重构与优化文档\n\n"
-        content += "> 架构演进、代码重构计划和最佳实践\n\n"
+        parts.append("## 🔧 重构与优化文档\n\n")
+        parts.append("> 架构演进、代码重构计划和最佳实践\n\n")
 
         if self.index['refactoring']:
             for refactor in self.index['refactoring']:
                 status_emoji = self.get_status_emoji(refactor.get('status'))
-                content += f"- {status_emoji} [{refactor['title']}]({refactor['path']})\n"
+                parts.append(f"- {status_emoji} [{refactor['title']}]({refactor['path']})\n")
         else:
-            content += "*暂无重构文档*\n\n"
+            parts.append("*暂无重构文档*\n\n")
 
-        content += "\n---\n\n"
+        parts.append("\n---\n\n")
 
         # 标签索引
-        content += "## 🏷️ 标签索引\n\n"
-        content += "> 按标签快速查找相关文档\n\n"
+        parts.append("## 🏷️ 标签索引\n\n")
+        parts.append("> 按标签快速查找相关文档\n\n")
 
         if self.tags_index:
             # 按标签文档数量排序
@@ -487,9 +505,9 @@ class DocsIndexer:
             popular_tags = [(tag, docs) for tag, docs in sorted_tags if len(docs) >= 2]
 
             if popular_tags:
-                content += "### 热门标签\n\n"
+                parts.append("### 热门标签\n\n")
                 for tag, docs in popular_tags[:15]:  # 显示前15个热门标签
-                    content += f"**#{tag}** ({len(docs)}个文档)\n"
+                    parts.append(f"**#{tag}** ({len(docs)}个文档)\n")
                     for doc in docs:
                         emoji_map = {
                             'feature': '🎯',
@@ -499,29 +517,29 @@ class DocsIndexer:
                         }
                         emoji = emoji_map.get(doc['type'], '📄')
                         status_emoji = self.get_status_emoji(doc.get('status') or '')
-                        content += f"- {emoji} {status_emoji} [{doc['title']}]({doc['path']})\n"
-                    content += "\n"
+                        parts.append(f"- {emoji} {status_emoji} [{doc['title']}]({doc['path']})\n")
+                    parts.append("\n")
 
             # 所有标签（字母序）
-            content += "### 所有标签\n\n"
-            content += "| 标签 | 文档数 | 文档列表 |\n"
-            content += "|------|--------|----------|\n"
+            parts.append("### 所有标签\n\n")
+            parts.append("| 标签 | 文档数 | 文档列表 |\n")
+            parts.append("|------|--------|----------|\n")
 
             for tag, docs in sorted(sorted_tags, key=lambda x: x[0]):
                 doc_links = ', '.join([f"[{doc['title']}]({doc['path']})" for doc in docs[:3]])
                 if len(docs) > 3:
                     doc_links += f" 等{len(docs)}个"
-                content += f"| #{tag} | {len(docs)} | {doc_links} |\n"
+                parts.append(f"| #{tag} | {len(docs)} | {doc_links} |\n")
 
-            content += "\n"
+            parts.append("\n")
         else:
-            content += "*暂无标签*\n\n"
+            parts.append("*暂无标签*\n\n")
 
-        content += "---\n\n"
+        parts.append("---\n\n")
 
         # 文档依赖关系图
-        content += "## 🔗 文档依赖关系图\n\n"
-        content += "> 显示文档之间的引用关系\n\n"
+        parts.append("## 🔗 文档依赖关系图\n\n")
+        parts.append("> 显示文档之间的引用关系\n\n")
 
         if self.dependencies:
             # 统计被引用最多的文档
@@ -536,29 +554,29 @@ class DocsIndexer:
             core_docs = [(path, count) for path, count in referenced_count.items() if count >= 3]
 
             if core_docs:
-                content += "### 🌟 核心文档（被引用≥3次）\n\n"
+                parts.append("### 🌟 核心文档（被引用≥3次）\n\n")
                 for path, count in sorted(core_docs, key=lambda x: x[1], reverse=True):
-                    content += f"- `{path}` - 被引用 **{count}** 次\n"
-                content += "\n"
+                    parts.append(f"- `{path}` - 被引用 **{count}** 次\n")
+                parts.append("\n")
 
             # 显示引用关系
-            content += "### 文档引用关系\n\n"
-            content += "<details>\n<summary>点击展开完整引用关系</summary>\n\n"
+            parts.append("### 文档引用关系\n\n")
+            parts.append("<details>\n<summary>点击展开完整引用关系</summary>\n\n")
 
             for source, targets in sorted(self.dependencies.items()):
-                content += f"**{source}** 引用:\n"
+                parts.append(f"**{source}** 引用:\n")
                 for target in targets:
-                    content += f"  - `{target}`\n"
-                content += "\n"
+                    parts.append(f"  - `{target}`\n")
+                parts.append("\n")
 
-            content += "</details>\n\n"
+            parts.append("</details>\n\n")
         else:
-            content += "*暂无文档引用关系*\n\n"
+            parts.append("*暂无文档引用关系*\n\n")
 
-        content += "---\n\n"
+        parts.append("---\n\n")
 
         # 使用指南
-        content += '''## 📖 使用指南
+        parts.append('''## 📖 使用指南
 
 ### 快速导航
 
@@ -587,8 +605,8 @@ class DocsIndexer:
 # 扫描开发文档并重新生成索引
 python scripts/generate_docs_index.py 开发文档
 ```
-'''
-        return content
+''')
+        return ''.join(parts)
 
     def run(self):
         """执行索引生成流程"""
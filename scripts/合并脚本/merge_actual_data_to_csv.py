@@ -21,6 +21,7 @@ import datetime as dt
 import sys
 from collections import Counter, defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Optional
 
@@ -116,6 +117,7 @@ ENUM_MAPPINGS = {
 
 
 ZERO_WIDTH_CHARS = "\u200b\u200c\u200d\ufeff\ufffd"
+ZERO_WIDTH_TABLE = {ord(ch): None for ch in ZERO_WIDTH_CHARS}
 
 
 def _normalize_text(value: object) -> str:
@@ -124,12 +126,14 @@ def _normalize_text(value: object) -> str:
     s = str(value)
     if not s:
         return ""
-    s = s.translate({ord(ch): None for ch in ZERO_WIDTH_CHARS})
+    s = s.translate(ZERO_WIDTH_TABLE)
     s = s.replace("\u3000", " ")
     s = " ".join(s.strip().split())
     return s
 
 
+# 同一文件中快照日期几乎都相同，按原始取值缓存解析结果，避免逐行重复 strptime
+@lru_cache(maxsize=1024)
 def _normalize_date_yyyy_mm_dd(value: object) -> tuple[str, Optional[str]]:
     raw = _normalize_text(value)
     if not raw:
@@ -153,6 +157,11 @@ def _normalize_date_yyyy_mm_dd(value: object) -> tuple[str, Optional[str]]:
 def _normalize_bool(value: object, field: str) -> tuple[bool, Optional[str]]:
     if isinstance(value, bool):
         return value, None
+    # 标准取值直接比较，跳过逐字符清洗
+    if value == "True":
+        return True, None
+    if value == "False":
+        return False, None
     raw = _normalize_text(value)
     if raw == "":
         return False, f"{field}: 为空，已默认 False"
@@ -214,6 +223,8 @@ def _parse_int(
     return str(int(num)), int(num), warn_or_err
 
 
+# 枚举字段取值种类很少，按 (字段, 原始取值) 缓存清洗与映射结果，每种取值只处理一次
+@lru_cache(maxsize=1024)
 def _map_enum(field: str, value: object) -> str:
     raw = _normalize_text(value)
     if raw == "":
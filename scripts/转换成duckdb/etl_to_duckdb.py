@@ -20,17 +20,50 @@
 import os
 import re
 import sys
-import glob
 import argparse
+import tempfile
+import multiprocessing
 import duckdb
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+# 可选依赖：python-calamine（Rust 实现的 Excel 解析器，比 openpyxl 快数倍）
+# pandas 2.2 起才支持 engine='calamine'，更低版本即使装了 python-calamine 也无法使用
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = tuple(int(x) for x in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# CSV 分块读取的块大小（DuckDB 每个向量 2048 行，100 个向量约 20 万行）
+CSV_CHUNK_VECTORS = 100
+
+# 预编译正则：从文件名识别周次（按优先级排列）、从文本中提取四位年份
+WEEK_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (r'第(\d+)周', r'周(\d+)', r'W(\d+)', r'week\s*(\d+)', r'(\d+)周')
+]
+YEAR_PATTERN = re.compile(r'((?:19|20)\d{2})')
+
+
+def safe_divide(numerator, denominator, default=0.0):
+    """
+    单次 NumPy 遍历完成逐元素除法，分母为 0 的位置取 default。
+    """
+    numerator = np.asarray(numerator, dtype='float64')
+    denominator = np.asarray(denominator, dtype='float64')
+    out = np.full_like(numerator, default)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
+
+
 class DataProcessor:
     """
     数据处理器 - 核心逻辑从 app.py 移植而来。
-    负责所有的数据转换、验证和计算。
+    负责所有的数据转换、验证和计算：字段标准化在 pandas 中逐文件完成，
+    绝对值字段的计算以 SQL 形式交给 DuckDB 在加载时执行。
     """
     
     def __init__(self):
@@ -45,6 +78,43 @@ class DataProcessor:
             'commercial_premium_before_discount_yuan', 'premium_plan_yuan',
             'marginal_contribution_amount_yuan', 'week_number'
         ]
+
+        # 目标表的字段类型，建表时预先声明，避免各文件推断出不同类型
+        self.field_types = {field: 'VARCHAR' for field in self.required_fields}
+        self.field_types.update({
+            'snapshot_date': 'TIMESTAMP',
+            'policy_start_year': 'INTEGER',
+            'week_number': 'INTEGER',
+            'is_new_energy_vehicle': 'BOOLEAN',
+            'is_transferred_vehicle': 'BOOLEAN',
+            'large_truck_score': 'DOUBLE',
+            'small_truck_score': 'DOUBLE',
+            'policy_count': 'BIGINT',
+            'claim_case_count': 'BIGINT',
+        })
+        self.field_types.update({field: 'DOUBLE' for field in self.required_fields if field.endswith('_yuan')})
+
+        # 低基数的文本维度字段（机构、险种、业务类型等），暂存时使用 category 类型
+        self.categorical_fields = [f for f in self.required_fields if self.field_types[f] == 'VARCHAR']
+
+        # 计算9个绝对值字段所需的中间字段
+        self.calc_input_fields = [
+            'signed_premium_wan', 'matured_premium_wan', 'average_premium',
+            'commercial_autonomous_coefficient', 'expense_ratio', 'variable_cost_ratio',
+            'claim_case_count', 'total_claim_wan'
+        ]
+
+        # 暂存字段：维度字段 + 计算所需的中间字段，绝对值字段在 DuckDB 中计算
+        absolute_fields = {
+            'signed_premium_yuan', 'matured_premium_yuan', 'policy_count', 'claim_case_count',
+            'reported_claim_payment_yuan', 'expense_amount_yuan',
+            'commercial_premium_before_discount_yuan', 'premium_plan_yuan',
+            'marginal_contribution_amount_yuan'
+        }
+        self.stage_fields = [f for f in self.required_fields if f not in absolute_fields] + self.calc_input_fields
+        # 暂存字段按类型分组，便于整块转换
+        self.stage_numeric_fields = self.calc_input_fields + ['large_truck_score', 'small_truck_score']
+        self.stage_integer_fields = ['policy_start_year', 'week_number']
         
         # 字段别名映射，用于兼容不同语言环境的列名
         self.field_alias_mapping = {
@@ -79,14 +149,36 @@ class DataProcessor:
             'week_number': ['week_number', '周次', 'Week Number']
         }
         
+        # 已处理数据中可逆向生成的中间字段 -> 所依赖的源字段（见 standardize_fields 预处理）
+        self.derivable_fields = {
+            'signed_premium_wan': 'signed_premium_yuan',
+            'matured_premium_wan': 'matured_premium_yuan',
+            'total_claim_wan': 'reported_claim_payment_yuan',
+            'expense_ratio': 'expense_amount_yuan',
+            'variable_cost_ratio': 'marginal_contribution_amount_yuan',
+            'average_premium': 'policy_count',
+            'commercial_autonomous_coefficient': 'commercial_premium_before_discount_yuan',
+        }
+
+        # 别名 -> (标准字段名, 别名优先级) 的反向索引，只在初始化时构建一次
+        self.alias_lookup = {
+            alias: (internal_name, priority)
+            for internal_name, aliases in self.field_alias_mapping.items()
+            for priority, alias in enumerate(aliases)
+        }
+
         self.boolean_map = {'是': True, '否': False, 'Y': True, 'N': False, 'true': True, 'false': False, True: True, False: False}
 
     def standardize_fields(self, df, original_filename=None, user_week_number=None):
         """标准化字段名和数据类型, 使用别名系统兼容多语言列名"""
         # 预处理：如果是已处理的数据（包含最终字段），则逆向生成必要的中间字段
         if 'signed_premium_yuan' in df.columns:
-            # Helper to safely convert to numeric
-            def safe_numeric(col): return pd.to_numeric(df[col], errors='coerce').fillna(0)
+            # 每个源字段只做一次数值转换并缓存为 NumPy 数组，后续运算都是 ufunc，不再经过 Series
+            numeric_cache = {}
+            def safe_numeric(col):
+                if col not in numeric_cache:
+                    numeric_cache[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype='float64')
+                return numeric_cache[col]
             
             if 'signed_premium_wan' not in df.columns:
                 df['signed_premium_wan'] = safe_numeric('signed_premium_yuan') / 10000
@@ -102,76 +194,55 @@ class DataProcessor:
                 # Handle division by zero
                 sp = safe_numeric('signed_premium_yuan')
                 ea = safe_numeric('expense_amount_yuan')
-                df['expense_ratio'] = ea / sp.replace(0, 1) # Avoid div by zero, will be 0/1=0 if sp is 0 but ea is 0. If ea>0 sp=0, it's problematic but let's assume 0.
-                df.loc[sp == 0, 'expense_ratio'] = 0
+                df['expense_ratio'] = safe_divide(ea, sp, default=0.0)
 
             if 'marginal_contribution_amount_yuan' in df.columns and 'variable_cost_ratio' not in df.columns:
                 # variable_cost_ratio = 1 - (marginal_contribution / matured_premium)
                 mp = safe_numeric('matured_premium_yuan')
                 mc = safe_numeric('marginal_contribution_amount_yuan')
-                df['variable_cost_ratio'] = 1 - (mc / mp.replace(0, 1))
-                df.loc[mp == 0, 'variable_cost_ratio'] = 0
+                df['variable_cost_ratio'] = 1 - safe_divide(mc, mp, default=1.0)
                 
             if 'average_premium' not in df.columns and 'policy_count' in df.columns:
                  # average_premium = matured_premium / policy_count
                  mp = safe_numeric('matured_premium_yuan')
                  pc = safe_numeric('policy_count')
-                 df['average_premium'] = mp / pc.replace(0, 1)
-                 df.loc[pc == 0, 'average_premium'] = 0
+                 df['average_premium'] = safe_divide(mp, pc, default=0.0)
 
             if 'commercial_premium_before_discount_yuan' in df.columns and 'commercial_autonomous_coefficient' not in df.columns:
                 # coeff = matured_premium / commercial_premium_before_discount
                 mp = safe_numeric('matured_premium_yuan')
                 cp = safe_numeric('commercial_premium_before_discount_yuan')
-                df['commercial_autonomous_coefficient'] = mp / cp.replace(0, 1)
-                df.loc[cp == 0, 'commercial_autonomous_coefficient'] = 1.0
-
-        rename_map = {}
-        found_internal_fields = set()
-        input_columns = df.columns.tolist()
-        
-        for internal_name, aliases in self.field_alias_mapping.items():
-            for alias in aliases:
-                if alias in input_columns:
-                    rename_map[alias] = internal_name
-                    found_internal_fields.add(internal_name)
-                    break
+                df['commercial_autonomous_coefficient'] = safe_divide(mp, cp, default=1.0)
+
+        # 一次遍历输入列做哈希查找；同一字段出现多个别名时取优先级最高（排在最前）的别名
+        matched_aliases = {}  # internal_name -> (优先级, 别名)
+        for column in df.columns:
+            hit = self.alias_lookup.get(column)
+            if hit is None:
+                continue
+            internal_name, priority = hit
+            if internal_name not in matched_aliases or priority < matched_aliases[internal_name][0]:
+                matched_aliases[internal_name] = (priority, column)
+
+        rename_map = {alias: internal_name for internal_name, (_, alias) in matched_aliases.items()}
+        found_internal_fields = set(matched_aliases)
         
-        required_for_calc = {
-            'signed_premium_wan', 'matured_premium_wan', 'average_premium', 
-            'claim_case_count', 'total_claim_wan', 'expense_ratio', 
-            'variable_cost_ratio', 'commercial_autonomous_coefficient'
-        }
-        
-        missing_fields = [f"'{field}' (别名: {', '.join(self.field_alias_mapping.get(field, []))})" for field in required_for_calc if field not in found_internal_fields]
-
-        if missing_fields:
-            raise ValueError(f"处理失败：输入文件 '{original_filename}' 缺少以下必需的列：\n" + "\n".join(missing_fields))
+        self.check_required_fields(found_internal_fields, original_filename)
 
-        df_renamed = df.rename(columns=rename_map)
-        result_df = df_renamed.copy()
+        # rename 已返回新的 DataFrame，后续新增/覆盖列不会影响输入，无需再整体 copy
+        result_df = df.rename(columns=rename_map)
         
         # 确保关键维度字段存在，否则赋予默认值
         for field in ['is_new_energy_vehicle', 'is_transferred_vehicle']:
             if field not in result_df.columns: result_df[field] = False
-            result_df[field] = result_df[field].apply(lambda x: self.boolean_map.get(x, False))
+            # 先 factorize 成整数编码，只对少量去重取值查映射表，再按编码取回整列；
+            # 未命中映射和空值（编码 -1，取到末尾追加的 False）都归为 False
+            codes, uniques = pd.factorize(result_df[field])
+            flags = np.append(pd.Series(uniques, dtype=object).map(self.boolean_map).eq(True).to_numpy(), False)
+            result_df[field] = flags[codes]
 
         if 'policy_start_year' in result_df.columns:
-            def extract_year(value):
-                if pd.isna(value): return 0
-                try:
-                    if isinstance(value, str):
-                        text = value.strip()
-                        if not text: return 0
-                        year_match = re.search(r'(19|20)\d{2}', text)
-                        if year_match: return int(year_match.group(0))
-                        date_obj = pd.to_datetime(text, errors='coerce')
-                        return int(date_obj.year) if pd.notna(date_obj) else 0
-                    if isinstance(value, (int, float)) and 1900 <= value <= 2100: return int(value)
-                    date_obj = pd.to_datetime(value, errors='coerce')
-                    return int(date_obj.year) if pd.notna(date_obj) else 0
-                except Exception: return 0
-            result_df['policy_start_year'] = result_df['policy_start_year'].apply(extract_year)
+            result_df['policy_start_year'] = self.extract_year(result_df['policy_start_year'])
         else:
             result_df['policy_start_year'] = 0
 
@@ -179,9 +250,8 @@ class DataProcessor:
         if user_week_number is not None:
             week_number = user_week_number
         elif original_filename:
-            patterns = [r'第(\d+)周', r'周(\d+)', r'W(\d+)', r'week\s*(\d+)', r'(\d+)周']
-            for pattern in patterns:
-                match = re.search(pattern, original_filename, re.IGNORECASE)
+            for pattern in WEEK_PATTERNS:
+                match = pattern.search(original_filename)
                 if match:
                     week_number = int(match.group(1))
                     break
@@ -197,58 +267,204 @@ class DataProcessor:
 
         return result_df
 
-    def calculate_absolute_fields(self, df):
-        """计算9个绝对值字段"""
-        result_df = df.copy()
-        
-        # Helper to safely convert to numeric
-        def to_numeric(series):
-            return pd.to_numeric(series, errors='coerce').fillna(0)
-
-        signed_premium_wan = to_numeric(df.get('signed_premium_wan', 0))
-        matured_premium_wan = to_numeric(df.get('matured_premium_wan', 0))
-        avg_premium = to_numeric(df.get('average_premium', 1.0)).replace(0, 1.0)
-        coeff = to_numeric(df.get('commercial_autonomous_coefficient', 1.0)).replace(0, 1.0)
-        expense_ratio = to_numeric(df.get('expense_ratio', 0))
-        variable_cost_ratio = to_numeric(df.get('variable_cost_ratio', 0))
-
-        result_df['signed_premium_yuan'] = signed_premium_wan * 10000
-        result_df['matured_premium_yuan'] = matured_premium_wan * 10000
-        result_df['commercial_premium_before_discount_yuan'] = result_df['matured_premium_yuan'] / coeff
-        result_df['policy_count'] = (result_df['matured_premium_yuan'] / avg_premium).round().astype(int)
-        result_df['claim_case_count'] = to_numeric(df.get('claim_case_count', 0)).astype(int)
-        result_df['reported_claim_payment_yuan'] = to_numeric(df.get('total_claim_wan', 0)) * 10000
-        result_df['expense_amount_yuan'] = result_df['signed_premium_yuan'] * expense_ratio
-        result_df['premium_plan_yuan'] = result_df['matured_premium_yuan'] # 默认等于满期保费
-        result_df['marginal_contribution_amount_yuan'] = result_df['matured_premium_yuan'] * (1 - variable_cost_ratio)
-        
-        return result_df
+    def check_required_fields(self, found_internal_fields, original_filename=None):
+        """检查计算所需的字段是否齐全，缺失时抛出 ValueError"""
+        missing_fields = [f"'{field}' (别名: {', '.join(self.field_alias_mapping.get(field, []))})" for field in self.calc_input_fields if field not in found_internal_fields]
+
+        if missing_fields:
+            raise ValueError(f"处理失败：输入文件 '{original_filename}' 缺少以下必需的列：\n" + "\n".join(missing_fields))
+
+    def validate_headers(self, columns, original_filename=None):
+        """
+        仅根据表头预先校验必需字段，在读取整个文件之前快速失败。
+        已处理数据（含 signed_premium_yuan）中可逆向生成的字段视为已提供。
+        """
+        found_internal_fields = {self.alias_lookup[c][0] for c in columns if c in self.alias_lookup}
+        if 'signed_premium_yuan' in columns:
+            found_internal_fields.update(
+                field for field, source in self.derivable_fields.items() if source in columns
+            )
+        self.check_required_fields(found_internal_fields, original_filename)
+
+    def extract_year(self, series):
+        """从保险起期列批量提取年份（向量化），无法识别时为 0"""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.year.fillna(0).astype(int)
+
+        # 保险起期通常只有少量不同取值：先 factorize，只解析去重后的取值，再按编码取回整列；
+        # 空值（编码 -1）取到末尾追加的 0
+        codes, uniques = pd.factorize(series.to_numpy())
+        if len(uniques) < len(series):
+            unique_years = self.extract_year(pd.Series(uniques, dtype=series.dtype)).to_numpy()
+            return pd.Series(np.append(unique_years, 0)[codes], index=series.index)
+
+        # 1. 数值（或数值文本）且落在合理年份范围内，直接作为年份
+        numeric = pd.to_numeric(series, errors='coerce')
+        years = numeric.where(numeric.between(1900, 2100)).to_numpy(dtype='float64', na_value=np.nan, copy=True)
+
+        if pd.api.types.is_numeric_dtype(series):
+            # 超出年份范围的数值按时间戳解析，与逐行解析的结果保持一致
+            rest = np.isnan(years) & numeric.notna().to_numpy()
+            if rest.any():
+                parsed = pd.to_datetime(numeric[rest], errors='coerce')
+                years[rest] = parsed.dt.year.to_numpy(dtype='float64', na_value=np.nan)
+        else:
+            # 2. 文本：先用正则提取四位年份，再按日期解析兜底
+            text = series.astype('string').str.strip()
+            pending = np.isnan(years) & text.fillna('').ne('').to_numpy(dtype=bool)
+            if pending.any():
+                matched = text[pending].str.extract(YEAR_PATTERN, expand=False)
+                years[pending] = pd.to_numeric(matched, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+                pending &= np.isnan(years)
+            if pending.any():
+                parsed = pd.to_datetime(text[pending], errors='coerce', format='mixed')
+                years[pending] = parsed.dt.year.to_numpy(dtype='float64', na_value=np.nan)
+
+        return pd.Series(years, index=series.index).fillna(0).astype(int)
+
+    def prepare_stage_frame(self, df):
+        """
+        将标准化后的数据裁剪为暂存字段，并统一为可写入 Parquet 的类型。
+        绝对值字段的计算与最终类型由 DuckDB 在加载时完成（见 absolute_fields_sql）。
+        """
+        stage_df = pd.DataFrame({field: df.get(field) for field in self.stage_fields})
+
+        # 类型转换：按目标类型分组后整块转换
+        numeric_fields = self.stage_numeric_fields
+        stage_df[numeric_fields] = (
+            stage_df[numeric_fields].apply(pd.to_numeric, errors='coerce').fillna(0).astype('float64')
+        )
+        integer_fields = self.stage_integer_fields
+        stage_df[integer_fields] = (
+            stage_df[integer_fields].apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int32)
+        )
+        stage_df['snapshot_date'] = pd.to_datetime(stage_df['snapshot_date'], errors='coerce')
+        # 低基数文本维度转为 category：内存更省，写入 Parquet 时为字典编码；
+        # 先统一为字符串，混合类型的列也能写入
+        stage_df[self.categorical_fields] = stage_df[self.categorical_fields].astype('string').astype('category')
+        return stage_df
+
+    def create_table_sql(self, table_name):
+        """生成按标准字段顺序与预声明类型建表的 DDL"""
+        columns = ',\n                '.join(f"{field} {self.field_types[field]}" for field in self.required_fields)
+        return f"""
+            CREATE TABLE {table_name} (
+                {columns}
+            )
+        """
+
+    def absolute_fields_sql(self, source):
+        """
+        生成在 DuckDB 中计算9个绝对值字段的 SELECT 语句，按标准字段顺序输出。
+        source 为暂存数据的表达式，如 read_parquet(?)。
+        """
+        matured_premium_yuan = 'matured_premium_wan * 10000'
+        expressions = {
+            'signed_premium_yuan': 'signed_premium_wan * 10000',
+            'matured_premium_yuan': matured_premium_yuan,
+            # 系数或单均保费为 0 时按 1 处理，即结果取满期保费本身
+            'commercial_premium_before_discount_yuan':
+                f'{matured_premium_yuan} / CASE WHEN commercial_autonomous_coefficient = 0 THEN 1 ELSE commercial_autonomous_coefficient END',
+            'policy_count':
+                f'CAST(round_even({matured_premium_yuan} / CASE WHEN average_premium = 0 THEN 1 ELSE average_premium END, 0) AS BIGINT)',
+            'claim_case_count': 'CAST(trunc(claim_case_count) AS BIGINT)',
+            'reported_claim_payment_yuan': 'total_claim_wan * 10000',
+            'expense_amount_yuan': 'signed_premium_wan * 10000 * expense_ratio',
+            'premium_plan_yuan': matured_premium_yuan,  # 默认等于满期保费
+            'marginal_contribution_amount_yuan': f'{matured_premium_yuan} * (1 - variable_cost_ratio)',
+        }
+        select_list = ',\n                '.join(
+            f"{expressions[field]} AS {field}" if field in expressions else field
+            for field in self.required_fields
+        )
+        return f"""
+            SELECT
+                {select_list}
+            FROM {source}
+        """
+
+def iter_source_chunks(file_path: str, excel_engine=None):
+    """
+    按块读取源文件，每次产出一个 DataFrame，内存占用与块大小而非文件大小相关。
+
+    CSV 由 DuckDB 原生读取器解析（文件路径通过参数绑定传入，避免拼接进 SQL），
+    再按 CSV_CHUNK_VECTORS 分批取出；Excel 单表行数有上限，仍整表读取。
+    """
+    if file_path.endswith(('.xlsx', '.xls')):
+        yield pd.read_excel(file_path, engine=excel_engine)
+        return
+
+    with duckdb.connect() as conn:
+        result = conn.execute(
+            "SELECT * FROM read_csv_auto(?, header=true, sample_size=-1)",
+            [file_path]
+        )
+        while True:
+            chunk = result.fetch_df_chunk(CSV_CHUNK_VECTORS)
+            if chunk.empty:
+                break
+            yield chunk
+
+
+def read_headers(file_path: str, excel_engine=None) -> list:
+    """只读取文件表头（列名），不加载数据行"""
+    if file_path.endswith(('.xlsx', '.xls')):
+        return pd.read_excel(file_path, engine=excel_engine, nrows=0).columns.tolist()
+    with duckdb.connect() as conn:
+        result = conn.execute("SELECT * FROM read_csv_auto(?, header=true) LIMIT 0", [file_path])
+        return [column[0] for column in result.description]
+
+
+def stage_file(file_path: str, stage_prefix: str, excel_engine=None):
+    """
+    提取并转换单个文件，按块写为 Parquet 暂存文件（在子进程中执行）。
+
+    Returns:
+        (暂存文件路径列表, 记录数, 耗时秒数)
+    """
+    file_start = datetime.now()
+    filename = Path(file_path).name
+    data_processor = DataProcessor()
+
+    # 0. 只读表头校验必需字段，缺列的文件不必完整读取
+    data_processor.validate_headers(read_headers(file_path, excel_engine), filename)
+
+    staged_paths = []
+    row_count = 0
+
+    # 1. 提取 (Extract)：逐块读取，提取、转换、暂存流水线进行
+    for chunk_index, df in enumerate(iter_source_chunks(file_path, excel_engine)):
+        # 2. 转换 (Transform)
+        df_std = data_processor.standardize_fields(df, filename)
+        stage_df = data_processor.prepare_stage_frame(df_std)
+
+        # 3. 暂存 (Stage)
+        staged_path = f"{stage_prefix}_{chunk_index:04d}.parquet"
+        stage_df.to_parquet(staged_path, engine='pyarrow', compression='zstd', index=False)
+        staged_paths.append(staged_path)
+        row_count += len(stage_df)
+
+    return staged_paths, row_count, (datetime.now() - file_start).total_seconds()
 
-    def finalize_output(self, df):
-        """确保最终输出的字段、顺序和类型正确"""
-        output_df = pd.DataFrame()
-        for field in self.required_fields:
-            output_df[field] = df.get(field)
-        
-        # 类型转换
-        for col in output_df.columns:
-            if 'yuan' in col or 'amount' in col or 'score' in col:
-                output_df[col] = pd.to_numeric(output_df[col], errors='coerce').fillna(0)
-            elif 'count' in col:
-                output_df[col] = pd.to_numeric(output_df[col], errors='coerce').fillna(0).astype(int)
-            elif 'year' in col or 'week' in col:
-                 output_df[col] = pd.to_numeric(output_df[col], errors='coerce').fillna(0).astype(int)
-            elif 'date' in col:
-                output_df[col] = pd.to_datetime(output_df[col], errors='coerce')
-        return output_df
 
 class ETLConverter:
     """ETL 转换器"""
 
-    def __init__(self, input_dir: str, output_db: str, table_name: str):
+    # 有效记录条件：起保年度、签单保费、周次均不为 0
+    VALID_RECORD_CONDITION = "policy_start_year <> 0 AND signed_premium_yuan <> 0 AND week_number <> 0"
+
+    def __init__(self, input_dir: str, output_db: str, table_name: str, excel_engine: str = 'calamine',
+                 workers: int = None, memory_limit: str = None):
         self.input_dir = input_dir
         self.output_db = output_db
         self.table_name = table_name
+        if excel_engine == 'calamine' and not CALAMINE_AVAILABLE:
+            print("⚠ python-calamine 未安装或 pandas 低于 2.2，Excel 将使用 pandas 默认引擎读取（较慢）")
+            excel_engine = None
+        self.excel_engine = excel_engine
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.memory_limit = memory_limit
+        self.staged_row_count = 0
         self.conn = None
         self.data_processor = DataProcessor()
 
@@ -258,10 +474,15 @@ class ETLConverter:
         逻辑：直接返回所有找到的文件，不进行任何筛选或去重。
         因为每个文件代表一周的独立数据（分片模式），需要全部导入。
         """
-        patterns = ["*.xlsx", "*.xls", "*.csv"]
-        all_files = []
-        for pattern in patterns:
-            all_files.extend(glob.glob(os.path.join(self.input_dir, pattern)))
+        # 一次 scandir 同时拿到文件名与大小（DirEntry 缓存了 stat 结果），不再多次 glob + getsize
+        with os.scandir(self.input_dir) as entries:
+            file_sizes = {
+                entry.path: entry.stat().st_size
+                for entry in entries
+                if entry.name.endswith(('.xlsx', '.xls', '.csv'))
+                and not entry.name.startswith('.') and entry.is_file()
+            }
+        all_files = list(file_sizes)
         
         if not all_files:
             print(f"❌ 错误: 在目录 '{self.input_dir}' 中未找到任何 .xlsx, .xls, 或 .csv 文件")
@@ -273,7 +494,7 @@ class ETLConverter:
         print(f"📁 找到 {len(all_files)} 个数据文件 (分周次明细):")
         total_size_mb = 0
         for i, file in enumerate(all_files, 1):
-            size_mb = os.path.getsize(file) / (1024 * 1024)
+            size_mb = file_sizes[file] / (1024 * 1024)
             total_size_mb += size_mb
             print(f"   {i}. {Path(file).name} ({size_mb:.2f} MB)")
         print(f"   总大小: {total_size_mb:.2f} MB")
@@ -290,42 +511,65 @@ class ETLConverter:
         self.conn = duckdb.connect(self.output_db)
         print("   ✅ 数据库连接已建立")
 
-    def process_and_import_files(self, files: list):
-        """处理并导入所有文件"""
-        print(f"\n📥 开始批量合并导入...")
-        total_start = datetime.now()
+        # 批量导入配置：多线程写入，且不要求保持插入顺序（省去线程间的排序屏障）
+        self.conn.execute(f"SET threads = {os.cpu_count() or 1}")
+        self.conn.execute("SET preserve_insertion_order = false")
+        if self.memory_limit:
+            self.conn.execute("SET memory_limit = ?", [self.memory_limit])
+        self.conn.execute(self.data_processor.create_table_sql(self.table_name))
+        print(f"   ✅ 表 '{self.table_name}' 已创建")
 
-        for i, file_path in enumerate(files, 1):
-            file_start = datetime.now()
-            filename = Path(file_path).name
-            print(f"\n   [{i}/{len(files)}] 处理: {filename}")
+    def process_and_import_files(self, files: list):
+        """
+        处理并导入所有文件
 
-            try:
-                # 1. 提取 (Extract)
-                if file_path.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_path)
-                else:
-                    df = pd.read_csv(file_path)
-                
-                # 2. 转换 (Transform)
-                df_std = self.data_processor.standardize_fields(df, filename)
-                df_calc = self.data_processor.calculate_absolute_fields(df_std)
-                final_df = self.data_processor.finalize_output(df_calc)
-                
-                # 3. 加载 (Load)
-                if i == 1:
-                    self.conn.execute(f"CREATE TABLE {self.table_name} AS SELECT * FROM final_df")
-                    print(f"      ✅ 表 '{self.table_name}' 已创建")
-                else:
-                    self.conn.execute(f"INSERT INTO {self.table_name} SELECT * FROM final_df")
-                    print(f"      ✅ 数据已追加")
-                
-                elapsed = (datetime.now() - file_start).total_seconds()
-                print(f"      ⏱️  耗时: {elapsed:.2f}秒")
+        各文件的提取与转换在独立进程中并行执行，结果写为 Parquet 暂存文件；
+        全部转换完成后由 DuckDB 并行读取所有暂存文件，一次性建表。
+        """
+        print(f"\n📥 开始批量合并导入 (并行进程数: {min(self.workers, len(files))})...")
+        total_start = datetime.now()
 
-            except Exception as e:
-                print(f"      ❌ 处理失败: {e}")
-                raise
+        # 暂存目录与输出数据库放在同一磁盘，流程结束后自动删除
+        stage_parent = Path(self.output_db).resolve().parent
+        with tempfile.TemporaryDirectory(prefix='etl_stage_', dir=stage_parent) as stage_dir:
+            staged_files = []
+
+            # 使用 spawn 启动子进程，避免 fork 复制 DuckDB 连接等父进程状态
+            mp_context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(files)), mp_context=mp_context) as executor:
+                futures = {
+                    executor.submit(stage_file, file_path, os.path.join(stage_dir, f"{i:04d}"), self.excel_engine): (i, file_path)
+                    for i, file_path in enumerate(files, 1)
+                }
+
+                for future in as_completed(futures):
+                    i, file_path = futures[future]
+                    print(f"\n   [{i}/{len(files)}] 处理: {Path(file_path).name}")
+                    try:
+                        staged_paths, row_count, elapsed = future.result()
+                    except Exception as e:
+                        print(f"      ❌ 处理失败: {e}")
+                        executor.shutdown(cancel_futures=True)
+                        raise
+                    staged_files.extend(staged_paths)
+                    self.staged_row_count += row_count
+                    print(f"      ✅ 已暂存 {row_count:,} 条记录")
+                    print(f"      ⏱️  耗时: {elapsed:.2f}秒")
+
+            # 4. 加载 (Load)：DuckDB 多线程读取全部暂存文件，在向量化引擎中计算绝对值字段，
+            #    并在写入前直接过滤无效记录，避免加载后再 DELETE
+            if staged_files:
+                load_start = datetime.now()
+                transform_sql = self.data_processor.absolute_fields_sql("read_parquet(?, union_by_name=true)")
+                self.conn.execute(f"""
+                    INSERT INTO {self.table_name}
+                    SELECT * FROM ({transform_sql})
+                    WHERE {self.VALID_RECORD_CONDITION}
+                """, [sorted(staged_files)])
+                load_elapsed = (datetime.now() - load_start).total_seconds()
+                print(f"\n   ✅ 数据已载入表 '{self.table_name}' (加载耗时: {load_elapsed:.2f}秒)")
+            else:
+                print(f"\n   ⚠️  所有文件均无数据行，表 '{self.table_name}' 为空")
 
         total_elapsed = (datetime.now() - total_start).total_seconds()
         print(f"\n✅ 所有文件合并完成，总耗时: {total_elapsed:.2f}秒")
@@ -354,23 +598,24 @@ class ETLConverter:
         print(f"   ✅ 视图 'v_trend_weekly' (按周汇总的关键指标)")
 
     def clean_data(self):
-        """数据清洗：删除关键指标为空的记录"""
+        """数据清洗：关键指标为空的记录已在加载时过滤，这里统计过滤数量"""
         print(f"\n🧹 数据清洗...")
-        result = self.conn.execute(f"""
-            DELETE FROM {self.table_name}
-            WHERE policy_start_year = 0 OR signed_premium_yuan = 0 OR week_number = 0
-        """)
-        deleted_count = result.fetchall()[0][0] if result else 0
-        if deleted_count > 0: print(f"   ⚠️  删除了 {deleted_count} 条无效记录")
+        loaded_count = self.conn.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+        deleted_count = self.staged_row_count - loaded_count
+        if deleted_count > 0: print(f"   ⚠️  加载时过滤了 {deleted_count} 条无效记录")
         else: print(f"   ✅ 数据完整，无需清理")
 
     def create_indexes(self):
-        """创建索引以优化查询性能"""
+        """
+        创建索引以优化查询性能
+
+        DuckDB 为列存引擎，分析查询依靠每个行组的 min/max 统计（zonemap）裁剪数据，
+        ART 索引只对点查有帮助，却会增加写入与存储开销。因此只保留周次、年度两个
+        常用于精确筛选的索引，不再为机构、业务类型等低基数维度建索引。
+        """
         print(f"\n⚡ 创建索引...")
         indexes = [
             ("idx_week", "week_number"), ("idx_year", "policy_start_year"),
-            ("idx_org", "third_level_organization"), ("idx_business", "business_type_category"),
-            ("idx_year_week", "policy_start_year, week_number"),
         ]
         for idx_name, columns in indexes:
             try:
@@ -461,12 +706,34 @@ def main():
         default="insurance_records",
         help="在 DuckDB 中创建的表名。"
     )
+    parser.add_argument(
+        "--excel-engine",
+        type=str,
+        choices=["calamine", "openpyxl", "xlrd"],
+        default="calamine",
+        help="读取 Excel 的解析引擎，默认 calamine（未安装或 pandas 低于 2.2 时回退到 pandas 默认引擎）。"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="并行处理文件的进程数，默认等于 CPU 核数。"
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=str,
+        default=None,
+        help="DuckDB 导入时的内存上限，如 '8GB'；默认使用 DuckDB 的默认值（物理内存的 80%%）。"
+    )
     args = parser.parse_args()
 
     converter = ETLConverter(
         input_dir=args.input_dir,
         output_db=args.output_db,
-        table_name=args.table_name
+        table_name=args.table_name,
+        excel_engine=args.excel_engine,
+        workers=args.workers,
+        memory_limit=args.memory_limit
     )
     converter.run()
 
@@ -138,14 +138,15 @@ def main():
         print(f"{'='*80}\n")
 
         xindu_44 = week44_df[week44_df['third_level_organization'] == '新都']
+        # 只展示前10项：nlargest 部分选择，无需对全部业务类型排序
         biz_stats = xindu_44.groupby('business_type_category').agg({
             'signed_premium_yuan': 'sum',
             'policy_count': 'sum'
-        }).sort_values('signed_premium_yuan', ascending=False)
+        }).nlargest(10, 'signed_premium_yuan')
 
         print("业务类型              签单保费(万元)     保单件数")
         print("-" * 60)
-        for biz, row in biz_stats.head(10).iterrows():
+        for biz, row in biz_stats.iterrows():
             print(f"{biz:20s} {row['signed_premium_yuan']/10000:12,.2f} {row['policy_count']:12,.0f}")
 
 if __name__ == "__main__":
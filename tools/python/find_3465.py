@@ -7,10 +7,20 @@
 
 import pandas as pd
 
+# 反复参与分组的维度字段，加载后转为 category，分组时按整数编码而非逐行哈希字符串
+GROUP_KEY_FIELDS = [
+    'third_level_organization', 'business_type_category',
+    'customer_category_3', 'insurance_type'
+]
+
 def load_week(week_num):
     """加载周数据"""
     file_path = f'实际数据/2025保单第{week_num}周变动成本明细表.csv'
-    return pd.read_csv(file_path, encoding='utf-8-sig')
+    df = pd.read_csv(file_path, encoding='utf-8-sig')
+    for col in GROUP_KEY_FIELDS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
 
 def try_various_filters(df, week_num):
     """尝试各种筛选条件"""
@@ -24,7 +34,7 @@ def try_various_filters(df, week_num):
 
     # 1. 检查是否是某个机构的累计值
     print("1️⃣  按三级机构筛选:")
-    org_groups = df.groupby('third_level_organization')['signed_premium_yuan'].sum() / 10000
+    org_groups = df.groupby('third_level_organization', observed=True)['signed_premium_yuan'].sum() / 10000
     for org, value in org_groups.items():
         if abs(value - target_value) < tolerance:
             print(f"  ✅ 找到匹配! {org}: {value:.2f} 万元")
@@ -34,7 +44,7 @@ def try_various_filters(df, week_num):
 
     # 2. 检查业务类型
     print(f"\n2️⃣  按业务类型筛选:")
-    biz_groups = df.groupby('business_type_category')['signed_premium_yuan'].sum() / 10000
+    biz_groups = df.groupby('business_type_category', observed=True)['signed_premium_yuan'].sum() / 10000
     for biz, value in biz_groups.items():
         if abs(value - target_value) < tolerance:
             print(f"  ✅ 找到匹配! {biz}: {value:.2f} 万元")
@@ -44,7 +54,7 @@ def try_various_filters(df, week_num):
 
     # 3. 检查客户类型
     print(f"\n3️⃣  按客户类型筛选:")
-    cust_groups = df.groupby('customer_category_3')['signed_premium_yuan'].sum() / 10000
+    cust_groups = df.groupby('customer_category_3', observed=True)['signed_premium_yuan'].sum() / 10000
     for cust, value in cust_groups.items():
         if abs(value - target_value) < tolerance:
             print(f"  ✅ 找到匹配! {cust}: {value:.2f} 万元")
@@ -54,7 +64,7 @@ def try_various_filters(df, week_num):
 
     # 4. 检查保险类型
     print(f"\n4️⃣  按保险类型筛选:")
-    ins_groups = df.groupby('insurance_type')['signed_premium_yuan'].sum() / 10000
+    ins_groups = df.groupby('insurance_type', observed=True)['signed_premium_yuan'].sum() / 10000
     for ins, value in ins_groups.items():
         if abs(value - target_value) < tolerance:
             print(f"  ✅ 找到匹配! {ins}: {value:.2f} 万元")
@@ -64,7 +74,7 @@ def try_various_filters(df, week_num):
 
     # 5. 检查组合条件（机构+业务类型）
     print(f"\n5️⃣  按机构+业务类型组合筛选（只显示接近的）:")
-    combo_groups = df.groupby(['third_level_organization', 'business_type_category'])['signed_premium_yuan'].sum() / 10000
+    combo_groups = df.groupby(['third_level_organization', 'business_type_category'], observed=True)['signed_premium_yuan'].sum() / 10000
     for (org, biz), value in combo_groups.items():
         if abs(value - target_value) < tolerance:
             print(f"  ✅ 找到匹配! {org} + {biz}: {value:.2f} 万元")
@@ -85,8 +95,8 @@ def check_increment_calculation(week43_df, week44_df):
 
     # 按机构计算增量
     print("按机构计算增量:")
-    w43_org = week43_df.groupby('third_level_organization')['signed_premium_yuan'].sum()
-    w44_org = week44_df.groupby('third_level_organization')['signed_premium_yuan'].sum()
+    w43_org = week43_df.groupby('third_level_organization', observed=True)['signed_premium_yuan'].sum()
+    w44_org = week44_df.groupby('third_level_organization', observed=True)['signed_premium_yuan'].sum()
 
     for org in w44_org.index:
         w43_val = w43_org.get(org, 0)
@@ -101,8 +111,8 @@ def check_increment_calculation(week43_df, week44_df):
 
     # 按业务类型计算增量
     print(f"\n按业务类型计算增量:")
-    w43_biz = week43_df.groupby('business_type_category')['signed_premium_yuan'].sum()
-    w44_biz = week44_df.groupby('business_type_category')['signed_premium_yuan'].sum()
+    w43_biz = week43_df.groupby('business_type_category', observed=True)['signed_premium_yuan'].sum()
+    w44_biz = week44_df.groupby('business_type_category', observed=True)['signed_premium_yuan'].sum()
 
     for biz in w44_biz.index:
         w43_val = w43_biz.get(biz, 0)
@@ -78,6 +78,9 @@ def simulate_use_trend_data(weeks, organization_filter='新都'):
     sorted_keys = sorted(grouped.keys())
     print(f"\n排序后的周次键: {sorted_keys}")
 
+    # 每周只聚合一次，之后的增量计算直接取已聚合的标量，不再重复扫描前一周的数据
+    week_aggs = {key: aggregate_data(grouped[key]) for key in sorted_keys}
+
     # 3. 计算各周的KPI（周增量模式）
     print(f"\n{'='*80}")
     print(f"📊 周增量模式计算过程")
@@ -87,20 +90,18 @@ def simulate_use_trend_data(weeks, organization_filter='新都'):
 
     for index, key in enumerate(sorted_keys):
         week_num = int(key.split('-')[1])
-        rows = grouped[key]
 
         print(f"--- 第{week_num}周 ---")
 
         if index > 0:
             # 周增量模式：计算当前周与前一周的差值
             previous_key = sorted_keys[index - 1]
-            previous_rows = grouped[previous_key]
 
             print(f"  模式: 周增量（相比第{int(previous_key.split('-')[1])}周）")
 
-            # 聚合当前周和前一周数据
-            current_agg = aggregate_data(rows)
-            previous_agg = aggregate_data(previous_rows)
+            # 当前周和前一周的聚合数据
+            current_agg = week_aggs[key]
+            previous_agg = week_aggs[previous_key]
 
             print(f"  当前周累计保费: {current_agg['signed_premium_yuan']/10000:,.2f} 万元")
             print(f"  前一周累计保费: {previous_agg['signed_premium_yuan']/10000:,.2f} 万元")
@@ -129,7 +130,7 @@ def simulate_use_trend_data(weeks, organization_filter='新都'):
             # 第一周：使用当周值
             print(f"  模式: 当周值（第一周，无前一周可比）")
 
-            current_agg = aggregate_data(rows)
+            current_agg = week_aggs[key]
             kpi = compute_kpis(current_agg)
 
             print(f"  signed_premium: {kpi['signed_premium']} 万元（当周值）")